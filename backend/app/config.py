@@ -8,6 +8,7 @@ class Settings(BaseSettings):
     
     # Google Gemini
     google_gemini_api_key: str
+    gemini_qpm: int = 500  # Requests per minute allowed by the API tier
     
     # OpenAI (optional - falls back to Gemini if not provided)
     openai_api_key: Optional[str] = None
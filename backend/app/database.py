@@ -3,11 +3,16 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, joinedload
 from sqlalchemy.pool import QueuePool
 from app.config import settings
+import orjson
 
 # Optimized engine with connection pooling
 engine = create_engine(
     settings.database_url,
     echo=False,  # Disable SQL logging in production for performance
+    # orjson is several times faster than stdlib json - every resume_json /
+    # jd_keywords column round-trips through these
+    json_serializer=lambda obj: orjson.dumps(obj).decode(),
+    json_deserializer=orjson.loads,
     poolclass=QueuePool,
     pool_size=10,  # Number of connections to maintain
     max_overflow=20,  # Max connections beyond pool_size
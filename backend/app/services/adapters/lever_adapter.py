@@ -18,9 +18,9 @@ class LeverAdapter:
         job_description: str
     ) -> Dict[str, Any]:
         """Autofill Lever form including AI-powered question answering"""
-        from app.utils.gemini_client import GeminiClient
+        from app.utils.gemini_client import get_gemini_client
         
-        gemini = GeminiClient()
+        gemini = get_gemini_client()
         session_id = str(uuid.uuid4())
         
         async with async_playwright() as p:
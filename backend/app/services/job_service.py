@@ -1,20 +1,442 @@
 from app.config import settings
 from app.utils.job_parser import JobParser
 from app.models import Job
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import httpx
 import json
+import orjson
+import hashlib
 from datetime import datetime, date as date_type
 import uuid
 import asyncio
+import os
+import re
+import tempfile
 import time
+from urllib.parse import urlsplit, urlunsplit
+
+# Simple in-memory cache for Google CSE responses (module-level so it survives
+# across requests - JobService is instantiated per request)
+# Keyed on (query, date_restrict, start) -> (items, timestamp)
+# Mirrored to a JSON file so a backend restart doesn't re-spend CSE quota on
+# the exact searches that were warm before the restart
+_cse_cache = {}
+_CSE_CACHE_TTL = 3600  # 1 hour - matches the shortest recency window
+_CSE_CACHE_MAX_SIZE = 4096
+_CSE_CACHE_PATH = os.path.join(tempfile.gettempdir(), "hack-a-job-cse-cache.json")
+_CSE_CACHE_SAVE_INTERVAL = 60  # Batch disk writes - at most one dump per minute
+_cse_cache_last_save = 0.0
+
+
+def _load_cse_cache():
+    """Seed the in-memory CSE cache from disk, skipping expired entries"""
+    try:
+        with open(_CSE_CACHE_PATH, 'rb') as f:
+            raw = orjson.loads(f.read())
+    except (OSError, ValueError):
+        return
+    now = time.time()
+    for key, entry in raw.items():
+        items, cached_time = entry
+        if now - cached_time >= _CSE_CACHE_TTL:
+            continue
+        # Keys are flattened as "query|date_restrict|start" (query may itself
+        # contain '|', the two trailing fields never do)
+        try:
+            query, date_restrict, start = key.rsplit('|', 2)
+            _cse_cache[(query, date_restrict, int(start))] = (items, cached_time)
+        except ValueError:
+            continue
+
+
+def _save_cse_cache():
+    """Dump the CSE cache to disk, rate-limited to one write per interval"""
+    global _cse_cache_last_save
+    now = time.time()
+    if now - _cse_cache_last_save < _CSE_CACHE_SAVE_INTERVAL:
+        return
+    _cse_cache_last_save = now
+    try:
+        payload = {f"{q}|{d}|{s}": entry for (q, d, s), entry in _cse_cache.items()}
+        tmp_path = _CSE_CACHE_PATH + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(payload))
+        os.replace(tmp_path, _CSE_CACHE_PATH)  # Atomic - readers never see a partial file
+    except OSError:
+        pass
+
+
+_load_cse_cache()
+
+# Cache of parsed job_data keyed on URL hash - parsing (BeautifulSoup/regex over
+# full HTML) is heavy, so re-surfaced URLs across searches skip fetch AND parse
+_job_data_cache = {}
+_JOB_DATA_CACHE_TTL = 3600
+_JOB_DATA_CACHE_MAX_SIZE = 4096
+
+# Known location variations for filter matching. Built once at import time
+# together with a reverse index (variation -> canonical region) and one
+# compiled word-bounded alternation per region, so the validator does a dict
+# lookup plus a single regex pass instead of nested per-variation substring
+# scans
+_LOCATION_GROUPS = {
+    'new york': ['new york', 'ny', 'nyc', 'new york city', 'manhattan', 'brooklyn', 'queens', 'bronx', 'staten island'],
+    'california': ['california', 'ca', 'san francisco', 'sf', 'los angeles', 'la', 'san diego', 'palo alto', 'san jose', 'oakland'],
+    'chicago': ['chicago', 'il', 'illinois'],
+    'boston': ['boston', 'ma', 'massachusetts'],
+    'seattle': ['seattle', 'wa', 'washington'],
+    'texas': ['texas', 'tx', 'austin', 'dallas', 'houston'],
+    'florida': ['florida', 'fl', 'miami', 'tampa', 'orlando'],
+}
+_VARIATION_TO_CANON = {
+    variation: canon
+    for canon, variations in _LOCATION_GROUPS.items()
+    for variation in variations
+}
+# \b keeps the short abbreviations honest - 'la' no longer matches inside
+# 'atlanta', 'ny' no longer matches inside 'company'
+_LOC_RE = {
+    canon: re.compile(r'\b(' + '|'.join(map(re.escape, variations)) + r')\b', re.IGNORECASE)
+    for canon, variations in _LOCATION_GROUPS.items()
+}
+# Common abbreviation expansions for the lenient fallback matcher, with a
+# word-bounded union so 'ca' doesn't fire inside 'chicago'
+_LOCATION_ABBREVS = {
+    'ny': 'new york',
+    'nyc': 'new york',
+    'ca': 'california',
+    'sf': 'san francisco',
+    'la': 'los angeles',
+    'il': 'illinois',
+    'ma': 'massachusetts',
+    'wa': 'washington',
+}
+_LOCATION_ABBREV_RE = re.compile(r'\b(' + '|'.join(map(re.escape, _LOCATION_ABBREVS)) + r')\b')
+
+# Tracking query params that don't change the page content - stripped before
+# URL dedup so the same posting with different campaign tags isn't fetched twice
+_TRACKING_PARAM_KEYS = {'gclid', 'fbclid', 'mc_cid', 'mc_eid', 'ref', 'refid', 'ref_src', 'src', 'trk'}
+
+
+def _canonicalize_url(url: str) -> str:
+    """Canonical URL for dedup: lowercase host, no tracking params/fragment,
+    remaining query params in sorted order"""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    query_parts = []
+    for kv in parts.query.split('&'):
+        if not kv:
+            continue
+        key = kv.split('=', 1)[0].lower()
+        if key.startswith('utm_') or key in _TRACKING_PARAM_KEYS:
+            continue
+        query_parts.append(kv)
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path.rstrip('/'),
+        # Sort so param order doesn't split one page into two cache/dedup keys
+        '&'.join(sorted(query_parts)),
+        ''  # drop fragment
+    ))
+
+
+# Near-duplicate detection: jobs whose title/company differ only trivially
+# ("Senior Software Engineer" vs "Sr. Software Engineer") hash to nearby
+# SimHash values; treat anything within this Hamming distance as a duplicate
+_SIMHASH_MAX_DISTANCE = 3
+
+
+def _simhash64(text: str) -> int:
+    """64-bit SimHash over whitespace tokens for near-duplicate detection"""
+    weights = [0] * 64
+    for token in text.split():
+        h = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'big')
+        for bit in range(64):
+            if (h >> bit) & 1:
+                weights[bit] += 1
+            else:
+                weights[bit] -= 1
+    value = 0
+    for bit in range(64):
+        if weights[bit] > 0:
+            value |= 1 << bit
+    return value
+
+
+def _window(html: str, n: int = 8192) -> str:
+    """Head+tail slice of a page for indicator scans.
+
+    Error banners and "job closed" notices sit in the visible text near the
+    top of the document (or occasionally the footer), so scanning 16KB instead
+    of a full 100KB body finds the same matches with a fraction of the memory
+    traffic.
+    """
+    if len(html) > 2 * n:
+        return html[:n] + html[-n:]
+    return html
+
+
+def _jd_digest(jd_text: str) -> str:
+    """Digest of a whitespace/case-normalized job description.
+
+    Catches the same posting syndicated to several boards under slightly
+    different titles, which the title/company checks can miss.
+    """
+    normalized = ' '.join(jd_text.lower().split())
+    return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+
+# Per-host fetch caps - many result URLs share a handful of hosts (linkedin,
+# indeed, ...), so keep overall concurrency high while staying polite per host
+# to avoid tripping their rate limits
+_host_semaphores = {}
+_PER_HOST_CONCURRENCY = 4
+# Pacing on top of the concurrency caps: consecutive requests to the same host
+# are spaced out by this much, while different hosts proceed independently
+# (a global sleep here would make fast hosts wait for slow ones)
+_host_last_request = {}
+_PER_HOST_MIN_INTERVAL = 0.25
+
+
+async def _maybe_delay(host: str):
+    """Sleep only as long as needed to keep per-host request spacing"""
+    while True:
+        now = time.monotonic()
+        last = _host_last_request.get(host, 0.0)
+        wait = _PER_HOST_MIN_INTERVAL - (now - last)
+        if wait <= 0:
+            # Single-threaded event loop and no await between the read above
+            # and this write, so claiming the slot is race-free
+            _host_last_request[host] = now
+            return
+        await asyncio.sleep(wait)
+
+_FETCH_CONCURRENCY = 10  # Overall cap on in-flight job-page fetches
+_CSE_CONCURRENCY = 5  # In-flight Google CSE calls - stays under the API's QPS limit
+
+# Shared CSE client - lazily created on first use and closed from the app
+# shutdown hook. Module-level (like the caches) because JobService itself is
+# instantiated per request; this keeps one warm TLS connection to
+# googleapis.com across all searches instead of a handshake per call
+_cse_client = None
+
+
+def _get_cse_client() -> httpx.AsyncClient:
+    global _cse_client
+    if _cse_client is None or _cse_client.is_closed:
+        _cse_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10)
+        )
+    return _cse_client
+
+
+async def close_cse_client():
+    """Close the shared CSE client - wired to the FastAPI shutdown event"""
+    global _cse_client
+    if _cse_client is not None and not _cse_client.is_closed:
+        await _cse_client.aclose()
+    _cse_client = None
+# keepalive_expiry keeps warm connections around for the whole fetch phase so
+# TLS handshakes amortize across the ~40 URLs we hit on each big board
+_FETCH_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30.0)
+# Stop reading a job page once we have this much - titles, descriptions and
+# structured data live well within the first 256KB, and some boards serve
+# multi-MB pages of scripts after that
+_MAX_HTML_BYTES = 256 * 1024
+# Don't even start reading bodies that declare more than this - a multi-MB
+# Content-Length on a "job page" is a PDF, a video or a data dump
+_MAX_CONTENT_LENGTH = 1024 * 1024
+
+# Conditional-request cache: body + validators (ETag / Last-Modified) per URL.
+# Bodies younger than the TTL are reused outright (no request at all); older
+# ones fall back to a conditional GET that short-circuits on 304. Small cap -
+# entries hold up to _MAX_HTML_BYTES each
+_html_cache = {}
+_HTML_CACHE_MAX_SIZE = 256
+_HTML_CACHE_TTL = 6 * 3600  # Job pages rarely change meaningfully within 6h
+
+# Search query templates - shared across every search_and_store_jobs call so
+# the templates aren't rebuilt per request
+_BASE_QUERY_TMPLS_WITH_LOC = (
+    '{query} jobs in {location}',
+    '{query} {location} jobs',
+    '{query} job {location}',
+    '{query} hiring {location}',
+    '{query} career {location}',
+    '{query} position {location}',
+)
+_BASE_QUERY_TMPLS = (
+    '{query} jobs',
+    '{query} job',
+    '{query} hiring',
+    '{query} career',
+    '{query} position',
+)
+_JOB_BOARD_TMPLS_WITH_LOC = (
+    '{query} site:linkedin.com/jobs {location}',
+    '{query} site:indeed.com {location}',
+    '{query} site:glassdoor.com {location}',
+    '{query} site:greenhouse.io {location}',
+    '{query} site:lever.co {location}',
+    '{query} site:monster.com {location}',
+    '{query} site:ziprecruiter.com {location}',
+    '{query} site:careers.google.com {location}',
+    '{query} site:jobs.apple.com {location}',
+    '{query} site:careers.microsoft.com {location}',
+)
+# Map recency to Google CSE dateRestrict format
+_DATE_MAPPING = {
+    "d7": "d7",
+    "w2": "w2",
+    "m1": "m1"
+}
+
+_JOB_BOARD_TMPLS = (
+    '{query} site:linkedin.com/jobs',
+    '{query} site:indeed.com',
+    '{query} site:glassdoor.com',
+    '{query} site:greenhouse.io',
+    '{query} site:lever.co',
+    '{query} site:monster.com',
+    '{query} site:ziprecruiter.com',
+)
+
+# URL/title filter patterns, compiled once at import. A single alternation
+# regex scans the string in one pass instead of one `in` check per pattern
+# Known job-board URL shapes - these are allowed through unconditionally
+_JOB_BOARD_URL_RE = re.compile('|'.join(re.escape(p) for p in (
+    'linkedin.com/jobs', 'indeed.com', 'glassdoor.com', 'greenhouse.io',
+    'lever.co', 'monster.com', 'ziprecruiter.com', 'careers.',
+    'jobs.', 'job.', 'hiring.', 'apply.', 'career.'
+)))
+
+_EXCLUDE_URL_RE = re.compile('|'.join(re.escape(p) for p in (
+    'facebook.com', 'twitter.com', 'instagram.com', 'linkedin.com/company',
+    'linkedin.com/in/', 'linkedin.com/feed', 'youtube.com', 'reddit.com',
+    'wikipedia.org', '/news/', '/blog/', '/article/', '/story/',
+    '.gov/', '.edu/', 'consulado', 'police', 'park', 'library', 'museum',
+    'aquarium', 'botanic', 'school', 'university', 'college', 'law.',
+    'nba.com', 'mlb.com', 'nhl.com', 'sports', 'entertainment',
+    'blockclubchicago', 'southsideweekly', 'abc7chicago', 'fox32chicago',
+    '6figr.com', 'levels.fyi', '/event/', '/events/', '/calendar/',
+    '/about/', '/contact/', '/privacy/', '/terms/', '/help/',
+    'linkedin.com/pulse'
+)))
+
+# Generic page titles on job-board URLs (homepage, login, error pages, ...)
+_GENERIC_PAGE_TITLE_RE = re.compile('|'.join(re.escape(p) for p in (
+    'homepage', 'home page', 'welcome', 'sign in', 'log in', 'login',
+    'privacy policy', 'terms of service', 'about us', 'contact us',
+    'request blocked', 'help us protect', 'blocked', 'access denied',
+    'page not found', '404', 'error', 'forbidden', 'not found',
+    'company not specified', 'not specified'
+)))
+
+# Titles that are content pages rather than postings (shared by the board
+# and non-board validation paths)
+_NON_JOB_TITLE_RE = re.compile('|'.join(re.escape(p) for p in (
+    'women in tech', 'event', 'workshop', 'conference', 'meetup',
+    'news', 'article', 'blog', 'story', 'press release',
+    'salary', 'interview', 'review', 'rating', 'comparison',
+    'guide', 'how to', 'tips', 'advice', 'career advice',
+    'resume template', 'cover letter template', 'sample'
+)))
+
+# Clear "this job is gone" messages. Only specific phrases - a lone word like
+# "unavailable" or "filled" shows up in job-board UI chrome and is not a
+# reliable signal that the posting itself is closed
+_UNAVAILABLE_SPECIFIC_RE = re.compile('|'.join(re.escape(p) for p in (
+    'no longer available', 'job is no longer available',
+    'position has been filled', 'this job is closed',
+    'application closed', 'position closed'
+)), re.IGNORECASE)
+
+# Boards with a known, fixed "job closed" phrase get a single-phrase check
+# instead of the generic alternation - cheaper and far less likely to trip on
+# unrelated page copy
+_UNAVAIL_BY_HOST = {
+    'greenhouse.io': re.compile(re.escape('no longer accepting applications'), re.IGNORECASE),
+    'lever.co': re.compile(re.escape('this job is no longer open'), re.IGNORECASE),
+    'glassdoor.com': re.compile(re.escape('job is no longer available'), re.IGNORECASE),
+    'ziprecruiter.com': re.compile(re.escape('this job is no longer available'), re.IGNORECASE),
+    'monster.com': re.compile(re.escape('this job is no longer available'), re.IGNORECASE),
+}
+
+
+def _unavailable_re_for_host(host: str):
+    """Board-specific closed-job pattern, or the generic one for unknown hosts"""
+    for suffix, pattern in _UNAVAIL_BY_HOST.items():
+        if host.endswith(suffix):
+            return pattern
+    return _UNAVAILABLE_SPECIFIC_RE
+
+# Error-page indicators (including non-English) scanned against page HTML
+_ERROR_PAGE_RE = re.compile('|'.join(re.escape(p) for p in (
+    'page not found', '404', 'error', 'not found',
+    'لم يتم العثور',  # Arabic: "not found"
+    'صفحة غير موجودة',  # Arabic: "page not found"
+    'página no encontrada',  # Spanish
+    'seite nicht gefunden',  # German
+    'ページが見つかりません',  # Japanese
+    'страница не найдена'  # Russian
+)), re.IGNORECASE)
+
+# Unavailable-job phrases scanned against the parsed description. Job-board
+# pages get the broad list; non-board pages keep the narrower historical one
+# (no lone 'filled', which false-positives on "fast-filled role" copy)
+_JD_UNAVAILABLE_BOARD_RE = re.compile('|'.join(re.escape(p) for p in (
+    'no longer available', 'no longer accepting', 'no longer accepting applications',
+    'position has been filled', 'this job is closed',
+    'application closed', 'position closed', 'expired', 'unavailable', 'filled',
+    'not accepting applications', 'applications closed'
+)), re.IGNORECASE)
+_JD_UNAVAILABLE_RE = re.compile('|'.join(re.escape(p) for p in (
+    'no longer available', 'position has been filled', 'this job is closed',
+    'application closed', 'position closed', 'expired', 'unavailable'
+)), re.IGNORECASE)
+
+# Job-board URL shapes _is_valid_job trusts with lenient validation (narrower
+# than _JOB_BOARD_URL_RE: specific posting paths, not whole board domains)
+_TRUSTED_BOARD_URL_RE = re.compile('|'.join(re.escape(p) for p in (
+    'linkedin.com/jobs', 'indeed.com/viewjob', 'indeed.com/jobs',
+    'glassdoor.com/job', 'monster.com', 'ziprecruiter.com',
+    'greenhouse.io', 'lever.co', 'careers.', 'jobs.'
+)))
+
+# Remote-work wording in location strings (already lowercased by the caller)
+_REMOTE_LOCATION_RE = re.compile('|'.join(re.escape(p) for p in (
+    'remote', 'anywhere', 'work from home', 'wfh', 'virtual', 'distributed'
+)))
+
+# Remote-work wording in job descriptions
+_REMOTE_JD_RE = re.compile('|'.join(re.escape(p) for p in (
+    'remote', 'anywhere', 'work from home', 'wfh', 'virtual', 'distributed', 'work remotely'
+)), re.IGNORECASE)
+
+# Placeholder company names the parser sometimes scrapes
+_INVALID_COMPANY_RE = re.compile('|'.join(re.escape(p) for p in (
+    'not specified', 'not available', 'unknown', 'n/a', 'na'
+)))
+
+# Generic/error titles on non-job-board URLs
+_GENERIC_TITLE_RE = re.compile('|'.join(re.escape(p) for p in (
+    'homepage', 'home page', 'welcome', 'just a moment',
+    'sorry, you have been blocked', 'headlines', 'upcoming events',
+    'request blocked', 'help us protect', 'blocked', 'access denied',
+    'page not found', '404', 'error', 'forbidden', 'loading',
+    'redirecting', 'please wait', 'checking your browser'
+)))
 
 class JobService:
     def __init__(self):
         self.parser = JobParser()
-        self.last_request_time = 0
-        self.min_request_interval = 0.5  # Minimum 500ms between requests to avoid rate limits
     
     async def search_and_store_jobs(
         self,
@@ -26,62 +448,21 @@ class JobService:
         """Search jobs using Google Custom Search API - matching Google's native job search format"""
         # Match Google's exact search format: "software jobs in california"
         # Google's native job search uses natural language, no site restrictions
-        
-        # Map recency to Google CSE dateRestrict format
-        date_mapping = {
-            "d7": "d7",
-            "w2": "w2",
-            "m1": "m1"
-        }
-        date_restrict = date_mapping.get(recency, "w2")
+
+        date_restrict = _DATE_MAPPING.get(recency, "w2")
         
         # Build multiple query strategies to maximize results
         # Google searches broadly across many sources, so we'll do the same
-        
-        base_queries = []
         if location:
-            base_queries = [
-                f'{query} jobs in {location}',
-                f'{query} {location} jobs',
-                f'{query} job {location}',
-                f'{query} hiring {location}',
-                f'{query} career {location}',
-                f'{query} position {location}',
-            ]
+            base_queries = [t.format(query=query, location=location) for t in _BASE_QUERY_TMPLS_WITH_LOC]
         else:
-            base_queries = [
-                f'{query} jobs',
-                f'{query} job',
-                f'{query} hiring',
-                f'{query} career',
-                f'{query} position',
-            ]
-        
+            base_queries = [t.format(query=query) for t in _BASE_QUERY_TMPLS]
+
         # Also search specific job boards directly (these give better results)
-        job_board_queries = []
         if location:
-            job_board_queries = [
-                f'{query} site:linkedin.com/jobs {location}',
-                f'{query} site:indeed.com {location}',
-                f'{query} site:glassdoor.com {location}',
-                f'{query} site:greenhouse.io {location}',
-                f'{query} site:lever.co {location}',
-                f'{query} site:monster.com {location}',
-                f'{query} site:ziprecruiter.com {location}',
-                f'{query} site:careers.google.com {location}',
-                f'{query} site:jobs.apple.com {location}',
-                f'{query} site:careers.microsoft.com {location}',
-            ]
+            job_board_queries = [t.format(query=query, location=location) for t in _JOB_BOARD_TMPLS_WITH_LOC]
         else:
-            job_board_queries = [
-                f'{query} site:linkedin.com/jobs',
-                f'{query} site:indeed.com',
-                f'{query} site:glassdoor.com',
-                f'{query} site:greenhouse.io',
-                f'{query} site:lever.co',
-                f'{query} site:monster.com',
-                f'{query} site:ziprecruiter.com',
-            ]
+            job_board_queries = [t.format(query=query) for t in _JOB_BOARD_TMPLS]
         
         # Combine all queries
         all_queries = base_queries + job_board_queries
@@ -94,132 +475,265 @@ class JobService:
         # Search job boards first (better quality, faster)
         # Rate limit: Google CSE allows ~100 queries/day free tier, so be smart
         # Search strategically: fewer queries but better quality
-        for search_query in job_board_queries[:7]:  # Top 7 job boards (reduced from 10)
-            for start in [1, 11]:  # 2 pages per board (reduced from 4) = 20 results each
-                items = await self._search_cse(search_query, date_restrict, start)
-                if not items:
-                    break
-                
+        # The shared module-level client keeps its googleapis.com connection
+        # warm across searches. Every (query, page) pair is independent, so
+        # schedule them all at once and let a small semaphore respect Google's
+        # QPS limit instead of the old serial sleep-between-requests pacing
+        cse_sem = asyncio.Semaphore(_CSE_CONCURRENCY)
+
+        def _collect(pages):
+            for items in pages:
                 for item in items:
                     url = item.get("link", "")
-                    if url and url not in seen_urls:
-                        seen_urls.add(url)
+                    # Dedupe on the canonical form (keep the original URL for
+                    # the actual GET)
+                    canonical = _canonicalize_url(url) if url else ""
+                    if canonical and canonical not in seen_urls:
+                        seen_urls.add(canonical)
                         all_items.append(item)
-                
-                # Rate limit: wait between requests
-                await asyncio.sleep(self.min_request_interval)
-                
-                if len(all_items) >= 150:  # Reduced from 300
-                    break
-            
-            if len(all_items) >= 150:
-                break
-        
+
+        async def _bounded_search(search_query, start):
+            async with cse_sem:
+                return await self._search_cse(search_query, date_restrict, start, client=cse_client)
+
+        cse_client = _get_cse_client()
+        pages = await asyncio.gather(*[
+            _bounded_search(search_query, start)
+            for search_query in job_board_queries[:7]  # Top 7 job boards (reduced from 10)
+            for start in [1, 11]  # 2 pages per board (reduced from 4) = 20 results each
+        ])
+        _collect(pages)
+
         # Then search base queries for more coverage (but fewer)
         if len(all_items) < 80:
-            for search_query in base_queries[:3]:  # Only top 3 base queries (reduced)
-                for start in [1, 11]:  # 2 pages each
-                    items = await self._search_cse(search_query, date_restrict, start)
-                    if not items:
-                        break
-                    
-                    for item in items:
-                        url = item.get("link", "")
-                        if url and url not in seen_urls:
-                            seen_urls.add(url)
-                            all_items.append(item)
-                    
-                    # Rate limit: wait between requests
-                    await asyncio.sleep(self.min_request_interval)
-                    
-                    if len(all_items) >= 150:
-                        break
-                
-                if len(all_items) >= 150:
-                    break
+            pages = await asyncio.gather(*[
+                _bounded_search(search_query, start)
+                for search_query in base_queries[:3]  # Only top 3 base queries (reduced)
+                for start in [1, 11]  # 2 pages each
+            ])
+            _collect(pages)
         
-        # all_items already deduplicated above, now process them
-        # Fetch and parse each job posting - optimize for speed but respect rate limits
-        jobs = []
-        async with httpx.AsyncClient(timeout=15.0) as client:  # Reduced timeout for speed
-            # Process items to account for filtering - we want 50-100+ good jobs
-            # Process up to 150 items (reduced from 300 to avoid rate limits)
-            total_items = min(len(all_items), 150)
-            
-            for idx, item in enumerate(all_items[:150]):
-                # Rate limit: add small delay between fetches to avoid overwhelming servers
-                if idx > 0 and idx % 10 == 0:  # Every 10 items, pause briefly
-                    await asyncio.sleep(0.2)
-                url = item.get("link", "")
-                if not url:
-                    continue
-                
-                # Filter out non-job URLs BEFORE fetching (saves time)
-                if self._is_non_job_url(url):
-                    continue
-                
-                try:
-                    # Fetch HTML with shorter timeout for speed
-                    response = await client.get(url, follow_redirects=True, timeout=10.0)
-                    html = response.text if response.text else ""
-                    
-                    # Quick check for unavailable jobs before parsing
-                    # BUT: Be more specific - don't skip LinkedIn/Indeed jobs based on generic text
-                    # These sites often have "unavailable" text in their UI that doesn't mean the job is closed
-                    is_linkedin_or_indeed = 'linkedin.com/jobs' in url or 'indeed.com' in url
-                    
-                    if not is_linkedin_or_indeed and html:
-                        # For other sites, check for unavailable indicators
-                        html_lower = html.lower()
-                        unavailable_indicators = [
-                            'no longer available', 'job is no longer available', 
-                            'position has been filled', 'this job is closed',
-                            'application closed', 'position closed', 'no longer accepting',
-                            'sorry this job', 'expired', 'unavailable', 'filled'
-                        ]
-                        # Only skip if we find a clear unavailable message (not just the word "unavailable" alone)
-                        if any(indicator in html_lower for indicator in unavailable_indicators):
-                            # Double-check: make sure it's not just a false positive
-                            # Skip if we see multiple indicators or very specific messages
-                            specific_indicators = [
-                                'no longer available', 'job is no longer available',
-                                'position has been filled', 'this job is closed',
-                                'application closed', 'position closed'
-                            ]
-                            if any(indicator in html_lower for indicator in specific_indicators):
-                                print(f"Skipping unavailable job: {url}")
-                                continue
-                    
-                    # Parse job posting
-                    job_data = await self.parser.parse_job_posting(url, html)
-                    
-                    if job_data and self._is_valid_job(job_data, location_filter=location, html=html):
-                        # Check for duplicates by title+company
-                        is_duplicate = False
-                        title = (job_data.get('title') or '').lower()
-                        company = (job_data.get('company') or '').lower()
-                        title_company_key = f"{title}_{company}"
-                        for existing_job in jobs:
-                            existing_title = (existing_job.title or '').lower() if existing_job.title else ''
-                            existing_company = (existing_job.company or '').lower() if existing_job.company else ''
-                            existing_key = f"{existing_title}_{existing_company}"
-                            if title_company_key == existing_key and title_company_key:
-                                is_duplicate = True
-                                break
-                        
-                        if not is_duplicate:
-                            # Store or update job
-                            job = self._upsert_job(job_data, db)
-                            if job:
-                                jobs.append(job)
-                except Exception as e:
-                    print(f"Error parsing job {url}: {e}")
-                    continue
-        
-        return jobs
-    
-    async def _search_cse(self, query: str, date_restrict: str, start: int) -> List[dict]:
-        """Search Google Custom Search API - matching Google's native search behavior"""
+        # all_items already deduplicated above, now process them.
+        # Filter out non-job URLs BEFORE scheduling any work - no point
+        # creating a task or burning a fetch slot on a URL the prefilter
+        # rejects, and the 150 cap then counts real candidates instead of
+        # being eaten by social/news links
+        candidates = [
+            item for item in all_items
+            if item.get("link") and not self._is_non_job_url(item["link"])
+        ]
+
+        # Fetching is I/O-bound, so fan out with asyncio.gather instead of
+        # awaiting each URL in turn - a bounded semaphore keeps overall
+        # concurrency polite and the per-host semaphores keep any one board
+        # from seeing a burst of connections
+        # Process up to 150 items (reduced from 300 to avoid rate limits)
+        fetch_sem = asyncio.Semaphore(_FETCH_CONCURRENCY)
+        async with httpx.AsyncClient(
+            http2=True,  # Multiplexes the many same-host fetches over one connection
+            timeout=httpx.Timeout(15.0, connect=5.0),  # Reduced timeout for speed
+            limits=_FETCH_LIMITS,
+            headers={
+                "Accept": "text/html,application/xhtml+xml",  # We only ever parse HTML
+                "Accept-Encoding": "gzip, deflate"  # Compressed transfer from boards that honor it
+            }
+        ) as client:
+            results = await asyncio.gather(
+                *[
+                    self._fetch_and_parse_item(item, client, fetch_sem, location)
+                    for item in candidates[:150]
+                ],
+                return_exceptions=True
+            )
+
+        # Dedup sequentially - the Session isn't safe to share across tasks
+        # and dedup is cheap compared to the network work above
+        deduped = []
+        seen_title_company = set()
+        seen_simhashes = []
+        seen_jd_digests = set()
+        for result in results:
+            if result is None or isinstance(result, Exception):
+                continue
+            job_data = result
+
+            # Check for duplicates: exact title+company key first,
+            # then SimHash over title/company/location to catch
+            # trivial variants of the same posting across boards
+            title = (job_data.get('title') or '').lower()
+            company = (job_data.get('company') or '').lower()
+            location_str = (job_data.get('location') or '').lower()
+            # Tuple key - no interpolated string to build/hash per job, and no
+            # false merge when a title itself ends in the separator character
+            title_company_key = (title, company)
+            is_duplicate = title_company_key in seen_title_company
+            simhash = None
+            if not is_duplicate:
+                simhash = _simhash64(f"{title} {company} {location_str}")
+                is_duplicate = any(
+                    (simhash ^ seen).bit_count() <= _SIMHASH_MAX_DISTANCE
+                    for seen in seen_simhashes
+                )
+
+            # Finally, hash the description body itself - syndicated postings
+            # often carry a reworded title but an identical JD
+            jd_digest = None
+            jd_text = job_data.get('jd_text') or ''
+            if not is_duplicate and len(jd_text) > 200:
+                jd_digest = _jd_digest(jd_text)
+                is_duplicate = jd_digest in seen_jd_digests
+
+            if not is_duplicate:
+                seen_title_company.add(title_company_key)
+                seen_simhashes.append(simhash)
+                if jd_digest:
+                    seen_jd_digests.add(jd_digest)
+                deduped.append(job_data)
+
+        # Store or update all surviving jobs in one batched upsert instead of
+        # a SELECT + INSERT/UPDATE + commit round-trip per job. The Session is
+        # synchronous, so run it in a worker thread rather than blocking the
+        # event loop for the INSERT + commit fsync
+        return await asyncio.to_thread(self._upsert_jobs_bulk, deduped, db)
+
+    async def _fetch_and_parse_item(self, item: dict, client: httpx.AsyncClient,
+                                    fetch_sem: asyncio.Semaphore, location: str = "") -> Optional[dict]:
+        """Fetch, parse and validate a single CSE result (already prefiltered).
+
+        Returns job_data or None.
+        """
+        url = item.get("link", "")
+
+        # Check the parsed-job cache - a hit skips both the fetch and
+        # the (expensive) parse
+        url_key = hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+        job_data = None
+        html = ""
+        cached = _job_data_cache.get(url_key)
+        if cached:
+            cached_job_data, cached_time = cached
+            if time.time() - cached_time < _JOB_DATA_CACHE_TTL:
+                job_data = cached_job_data
+            else:
+                del _job_data_cache[url_key]
+
+        try:
+            if job_data is None:
+                cached_html = _html_cache.get(url_key)
+
+                if cached_html and time.time() - cached_html[3] < _HTML_CACHE_TTL:
+                    # Body is fresh enough - reuse it without touching the network
+                    html = cached_html[0]
+                else:
+                    # Fetch HTML with shorter timeout for speed, capped globally
+                    # and per host
+                    host = urlsplit(url).netloc
+                    host_sem = _host_semaphores.setdefault(host, asyncio.Semaphore(_PER_HOST_CONCURRENCY))
+                    # If this URL was fetched before, offer its validators so the
+                    # server can answer 304 Not Modified with an empty body
+                    req_headers = {}
+                    if cached_html:
+                        if cached_html[1]:
+                            req_headers["If-None-Match"] = cached_html[1]
+                        if cached_html[2]:
+                            req_headers["If-Modified-Since"] = cached_html[2]
+
+                    # Hold the semaphores only for the network read - decoding and
+                    # parsing below don't touch the wire, and keeping a fetch slot
+                    # through a multi-second parse would starve other tasks
+                    async with fetch_sem:
+                        async with host_sem:
+                            await _maybe_delay(host)
+                            # Stream the body and stop at _MAX_HTML_BYTES instead
+                            # of downloading whole pages we'd only parse the top of
+                            async with client.stream("GET", url, headers=req_headers,
+                                                     follow_redirects=True, timeout=10.0) as response:
+                                # Guard on the headers before touching the body:
+                                # skip non-HTML payloads and anything declaring
+                                # an absurd size for a job page
+                                content_type = response.headers.get("content-type", "")
+                                if content_type and "html" not in content_type:
+                                    print(f"Skipping non-HTML response ({content_type}): {url}")
+                                    return None
+                                content_length = int(response.headers.get("content-length", "0") or 0)
+                                if content_length > _MAX_CONTENT_LENGTH:
+                                    print(f"Skipping oversized page ({content_length} bytes): {url}")
+                                    return None
+                                chunks = []
+                                received = 0
+                                async for chunk in response.aiter_bytes():
+                                    chunks.append(chunk)
+                                    received += len(chunk)
+                                    if received >= _MAX_HTML_BYTES:
+                                        break
+
+                    if response.status_code == 304 and cached_html:
+                        # Page unchanged since the last fetch - reuse the stored
+                        # body, refreshing its timestamp so the freshness window
+                        # restarts from this revalidation
+                        html = cached_html[0]
+                        _html_cache[url_key] = (html, cached_html[1], cached_html[2], time.time())
+                    else:
+                        encoding = response.charset_encoding or "utf-8"
+                        html = b"".join(chunks).decode(encoding, errors="replace")
+                        # Remember the body when the server handed us a validator
+                        # to revalidate against next time
+                        etag = response.headers.get("etag")
+                        last_modified = response.headers.get("last-modified")
+                        if html and (etag or last_modified):
+                            _html_cache[url_key] = (html, etag, last_modified, time.time())
+                            if len(_html_cache) > _HTML_CACHE_MAX_SIZE:
+                                oldest_key = min(_html_cache.keys(), key=lambda k: _html_cache[k][3])
+                                del _html_cache[oldest_key]
+
+                # Quick check for unavailable jobs before parsing
+                # BUT: Be more specific - don't skip LinkedIn/Indeed jobs based on generic text
+                # These sites often have "unavailable" text in their UI that doesn't mean the job is closed
+                is_linkedin_or_indeed = 'linkedin.com/jobs' in url or 'indeed.com' in url
+
+                if not is_linkedin_or_indeed and html:
+                    # For other sites, check for unavailable indicators.
+                    # Boards we know get their exact closed-job phrase; others
+                    # fall back to the generic specific-phrase alternation.
+                    # IGNORECASE means no html.lower() copy of the full page
+                    if _unavailable_re_for_host(urlsplit(url).netloc.lower()).search(_window(html)):
+                        print(f"Skipping unavailable job: {url}")
+                        return None
+
+                # Parse job posting in a worker thread - BeautifulSoup
+                # is CPU-bound and would otherwise block the event loop
+                # while other fetches are in flight
+                job_data = await asyncio.to_thread(self.parser.parse_job_posting_sync, url, html)
+
+                # Cache successful parses so re-surfaced URLs skip this work
+                if job_data:
+                    _job_data_cache[url_key] = (job_data, time.time())
+                    if len(_job_data_cache) > _JOB_DATA_CACHE_MAX_SIZE:
+                        oldest_key = min(_job_data_cache.keys(), key=lambda k: _job_data_cache[k][1])
+                        del _job_data_cache[oldest_key]
+
+            if job_data and self._is_valid_job(job_data, location_filter=location, html=html):
+                return job_data
+        except Exception as e:
+            print(f"Error parsing job {url}: {e}")
+        return None
+
+    async def _search_cse(self, query: str, date_restrict: str, start: int,
+                          client: Optional[httpx.AsyncClient] = None) -> List[dict]:
+        """Search Google Custom Search API - matching Google's native search behavior
+
+        Uses the shared module-level client unless one is injected.
+        """
+        # Check cache first - repeated searches for the same role+city within the
+        # TTL skip the paid, QPS-limited CSE call entirely
+        cache_key = (query.strip(), date_restrict, start)
+        cached = _cse_cache.get(cache_key)
+        if cached:
+            cached_items, cached_time = cached
+            if time.time() - cached_time < _CSE_CACHE_TTL:
+                return cached_items
+            del _cse_cache[cache_key]
+
         params = {
             "key": settings.google_cse_key,
             "cx": settings.google_cse_cx,
@@ -233,124 +747,130 @@ class JobService:
             # The filtering will handle removing non-job URLs
         }
         
-        # Rate limiting: ensure minimum time between requests
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        if time_since_last_request < self.min_request_interval:
-            await asyncio.sleep(self.min_request_interval - time_since_last_request)
+        if client is None:
+            client = _get_cse_client()
+        max_retries = 3
+        retry_delay = 2  # Start with 2 seconds
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            max_retries = 3
-            retry_delay = 2  # Start with 2 seconds
-            
-            for attempt in range(max_retries):
-                try:
-                    self.last_request_time = time.time()
-                    response = await client.get(
-                        "https://www.googleapis.com/customsearch/v1",
-                        params=params
-                    )
-                    
-                    # Handle rate limiting (429)
-                    if response.status_code == 429:
-                        if attempt < max_retries - 1:
-                            wait_time = retry_delay * (2 ** attempt)  # Exponential backoff: 2s, 4s, 8s
-                            print(f"Rate limited (429). Waiting {wait_time}s before retry {attempt + 1}/{max_retries}...")
-                            await asyncio.sleep(wait_time)
-                            continue
-                        else:
-                            print(f"Rate limited (429) after {max_retries} attempts. Skipping this query.")
-                            return []
-                    
-                    response.raise_for_status()
-                    data = response.json()
-                    return data.get("items", [])
-                    
-                except httpx.HTTPStatusError as e:
-                    if e.response.status_code == 429:
-                        if attempt < max_retries - 1:
-                            wait_time = retry_delay * (2 ** attempt)
-                            print(f"Rate limited (429). Waiting {wait_time}s before retry {attempt + 1}/{max_retries}...")
-                            await asyncio.sleep(wait_time)
-                            continue
-                        else:
-                            print(f"Rate limited (429) after {max_retries} attempts. Skipping this query.")
-                            return []
+        for attempt in range(max_retries):
+            try:
+                response = await client.get(
+                    "https://www.googleapis.com/customsearch/v1",
+                    params=params
+                )
+                
+                # Handle rate limiting (429)
+                if response.status_code == 429:
+                    if attempt < max_retries - 1:
+                        wait_time = retry_delay * (2 ** attempt)  # Exponential backoff: 2s, 4s, 8s
+                        print(f"Rate limited (429). Waiting {wait_time}s before retry {attempt + 1}/{max_retries}...")
+                        await asyncio.sleep(wait_time)
+                        continue
+                    else:
+                        print(f"Rate limited (429) after {max_retries} attempts. Skipping this query.")
+                        return []
+                
+                response.raise_for_status()
+                # orjson parses the raw bytes directly - faster than
+                # response.json() (stdlib json + an intermediate str decode)
+                # on the 50-100KB CSE payloads
+                data = orjson.loads(response.content)
+                items = data.get("items", [])
+
+                # Cache successful responses
+                _cse_cache[cache_key] = (items, time.time())
+                # Evict oldest entries if cache grows too large
+                if len(_cse_cache) > _CSE_CACHE_MAX_SIZE:
+                    oldest_key = min(_cse_cache.keys(), key=lambda k: _cse_cache[k][1])
+                    del _cse_cache[oldest_key]
+                # Mirror to disk (rate-limited) so restarts keep warm entries
+                _save_cse_cache()
+
+                return items
+                
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 429:
+                    if attempt < max_retries - 1:
+                        wait_time = retry_delay * (2 ** attempt)
+                        print(f"Rate limited (429). Waiting {wait_time}s before retry {attempt + 1}/{max_retries}...")
+                        await asyncio.sleep(wait_time)
+                        continue
                     else:
-                        print(f"HTTP error searching CSE: {e}")
+                        print(f"Rate limited (429) after {max_retries} attempts. Skipping this query.")
                         return []
-                except Exception as e:
-                    print(f"Error searching CSE: {e}")
+                else:
+                    print(f"HTTP error searching CSE: {e}")
                     return []
-            
+            except Exception as e:
+                print(f"Error searching CSE: {e}")
+                return []
+
+        return []
+
+    # Job columns the parser is allowed to fill - anything else in job_data is dropped
+    _JOB_UPSERT_FIELDS = (
+        "company", "title", "location", "region", "remote",
+        "date_posted", "valid_through", "salary", "url",
+        "source", "jd_text", "jd_keywords"
+    )
+
+    def _upsert_jobs_bulk(self, job_datas: List[dict], db: Session) -> List[Job]:
+        """Upsert a batch of jobs in a single INSERT ... ON CONFLICT statement.
+
+        One statement + one commit for the whole batch instead of a SELECT,
+        INSERT/UPDATE and commit per job (Job.url is unique, so Postgres
+        resolves new-vs-existing for us).
+        """
+        rows = []
+        seen_batch_urls = set()
+        for job_data in job_datas:
+            url = job_data.get("url")
+            if not url or url in seen_batch_urls:
+                continue
+            seen_batch_urls.add(url)
+            # Normalize every row to the same column set so they can share
+            # one executemany-style VALUES clause
+            row = {field: job_data.get(field) for field in self._JOB_UPSERT_FIELDS}
+            if row["remote"] is None:
+                row["remote"] = False
+            # Deterministic id derived from the URL: re-inserting the same
+            # posting always proposes the same id (cheaper than uuid4's
+            # urandom call, and friendlier to debugging duplicate rows)
+            row["id"] = uuid.uuid5(uuid.NAMESPACE_URL, url)
+            rows.append(row)
+
+        if not rows:
             return []
-    
-    def _upsert_job(self, job_data: dict, db: Session) -> Optional[Job]:
-        """Upsert job with deduplication by URL"""
-        url = job_data.get("url")
-        if not url:
-            return None
-        
-        # Filter out fields that don't exist in Job model
-        valid_fields = {
-            "company", "title", "location", "region", "remote", 
-            "date_posted", "valid_through", "salary", "url", 
-            "source", "jd_text", "jd_keywords"
-        }
-        filtered_data = {k: v for k, v in job_data.items() if k in valid_fields}
-        
-        # Check if job already exists
-        existing = db.query(Job).filter(Job.url == url).first()
-        
-        if existing:
-            # Update existing job
-            for key, value in filtered_data.items():
-                if hasattr(existing, key) and value is not None:
-                    setattr(existing, key, value)
-            db.commit()
-            db.refresh(existing)
-            return existing
-        else:
-            # Create new job
-            job = Job(
-                id=uuid.uuid4(),
-                **filtered_data
-            )
-            db.add(job)
-            db.commit()
-            db.refresh(job)
-            return job
-    
+
+        stmt = pg_insert(Job).values(rows)
+        # On conflict keep the existing value when the fresh parse came back
+        # empty - same semantics as the old per-field "if value is not None"
+        # update loop
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Job.url],
+            set_={
+                field: func.coalesce(stmt.excluded[field], getattr(Job, field))
+                for field in self._JOB_UPSERT_FIELDS if field != "url"
+            }
+        )
+        db.execute(stmt)
+        db.commit()
+
+        # Hydrate ORM instances for the response in one SELECT
+        urls = [row["url"] for row in rows]
+        return list(db.execute(select(Job).where(Job.url.in_(urls))).scalars().all())
+
+
     def _is_non_job_url(self, url: str) -> bool:
         """Filter out URLs that are clearly not job postings"""
         url_lower = url.lower()
-        
-        # Allow job board URLs (these are good!)
-        job_board_patterns = [
-            'linkedin.com/jobs', 'indeed.com', 'glassdoor.com', 'greenhouse.io',
-            'lever.co', 'monster.com', 'ziprecruiter.com', 'careers.',
-            'jobs.', 'job.', 'hiring.', 'apply.', 'career.'
-        ]
-        
-        # If it's from a known job board, allow it
-        if any(pattern in url_lower for pattern in job_board_patterns):
+
+        # If it's from a known job board, allow it (single precompiled scan)
+        if _JOB_BOARD_URL_RE.search(url_lower):
             return False
-        
-        # Exclude common non-job domains
-        exclude_patterns = [
-            'facebook.com', 'twitter.com', 'instagram.com', 'linkedin.com/company',
-            'linkedin.com/in/', 'linkedin.com/feed', 'youtube.com', 'reddit.com',
-            'wikipedia.org', '/news/', '/blog/', '/article/', '/story/',
-            '.gov/', '.edu/', 'consulado', 'police', 'park', 'library', 'museum',
-            'aquarium', 'botanic', 'school', 'university', 'college', 'law.',
-            'nba.com', 'mlb.com', 'nhl.com', 'sports', 'entertainment',
-            'blockclubchicago', 'southsideweekly', 'abc7chicago', 'fox32chicago',
-            '6figr.com', 'levels.fyi', '/event/', '/events/', '/calendar/',
-            '/about/', '/contact/', '/privacy/', '/terms/', '/help/',
-            'linkedin.com/company/', 'linkedin.com/feed', 'linkedin.com/pulse'
-        ]
-        
-        return any(pattern in url_lower for pattern in exclude_patterns)
+
+        # Exclude common non-job domains (single precompiled alternation scan)
+        return _EXCLUDE_URL_RE.search(url_lower) is not None
     
     def _is_valid_job(self, job_data: dict, location_filter: Optional[str] = None, html: Optional[str] = None) -> bool:
         """
@@ -363,208 +883,98 @@ class JobService:
         jd_text = job_data.get("jd_text") or ""
         url = (job_data.get("url") or "").lower()
         job_location = (job_data.get("location") or "").lower() if job_data.get("location") else ""
-        
+
+        # Lowercase the title once up front for the keyword scans below. The
+        # page-sized fields (jd_text, html) are matched with IGNORECASE regexes
+        # in place - no tens-of-KB lowered copies per job
+        title_lower = title.lower()
+
         # CRITICAL CHECKS ONLY - reject if missing essential data
         if not title:
             print(f"❌ Rejecting: Missing title - {url[:50]}")
             return False
         
         # Check if this is from a known job board - trust these sources
-        is_job_board_url = any(board in url for board in [
-            'linkedin.com/jobs', 'indeed.com/viewjob', 'indeed.com/jobs', 
-            'glassdoor.com/job', 'monster.com', 'ziprecruiter.com',
-            'greenhouse.io', 'lever.co', 'careers.', 'jobs.'
-        ])
-        
-        # For job boards, be VERY lenient - only reject obvious errors
-        if is_job_board_url:
-            # Only reject if:
-            # 1. Title is clearly a generic page (homepage, login, etc.)
-            # 2. Job is explicitly unavailable
-            # 3. Future date (parsing error)
-            
-            title_lower = title.lower()
-            generic_page_titles = [
-                'homepage', 'home page', 'welcome', 'sign in', 'log in', 'login',
-                'privacy policy', 'terms of service', 'about us', 'contact us',
-                'request blocked', 'help us protect', 'blocked', 'access denied',
-                'page not found', '404', 'error', 'forbidden', 'not found',
-                'company not specified', 'not specified'
-            ]
-            
-            # Reject generic page titles and error pages
-            if any(generic in title_lower for generic in generic_page_titles):
-                print(f"❌ Rejecting: Generic/error page title '{title}' - {url[:50]}")
-                return False
-            
-            # Additional checks: reject titles that are clearly not job postings
-            # Check for common non-job patterns in titles
-            non_job_patterns = [
-                'women in tech', 'event', 'workshop', 'conference', 'meetup',
-                'news', 'article', 'blog', 'story', 'press release',
-                'salary', 'interview', 'review', 'rating', 'comparison',
-                'guide', 'how to', 'tips', 'advice', 'career advice',
-                'resume template', 'cover letter template', 'sample'
-            ]
-            if any(pattern in title_lower for pattern in non_job_patterns):
-                print(f"❌ Rejecting: Non-job pattern in title '{title}' - {url[:50]}")
-                return False
-            
-            # Reject titles that start with numbers (parsing errors like "33Data")
-            if title and len(title) > 0 and title[0].isdigit():
-                # Check if it's a valid format (like "2024 Software Engineer") vs invalid ("33Data")
-                words = title.split()
-                if len(words) > 0 and words[0].isdigit() and len(words[0]) <= 2:
-                    # Short number prefix (like "33") is likely a parsing error
-                    print(f"❌ Rejecting: Invalid title format '{title}' - {url[:50]}")
-                    return False
-            
-            # Check HTML content for error indicators (including non-English)
-            if html:
-                html_lower = html.lower()
-                # Common error page indicators in various languages
-                error_indicators = [
-                    'page not found', '404', 'error', 'not found',
-                    'لم يتم العثور',  # Arabic: "not found"
-                    'صفحة غير موجودة',  # Arabic: "page not found"
-                    'página no encontrada',  # Spanish
-                    'seite nicht gefunden',  # German
-                    'ページが見つかりません',  # Japanese
-                    'страница не найдена'  # Russian
-                ]
-                if any(indicator in html_lower for indicator in error_indicators):
-                    print(f"❌ Rejecting: Error page detected in HTML '{title}' - {url[:50]}")
-                    return False
-            
-            # Check for unavailable jobs
-            if jd_text:
-                jd_lower = jd_text.lower()
-                unavailable_indicators = [
-                    'no longer available', 'no longer accepting', 'no longer accepting applications',
-                    'position has been filled', 'this job is closed',
-                    'application closed', 'position closed', 'expired', 'unavailable', 'filled',
-                    'not accepting applications', 'applications closed'
-                ]
-                if any(indicator in jd_lower for indicator in unavailable_indicators):
-                    print(f"❌ Rejecting: Unavailable job '{title}' - {url[:50]}")
-                    return False
-            
-            # Check for future dates (parsing errors)
-            date_posted = job_data.get("date_posted")
-            if date_posted:
-                from datetime import date, timedelta
-                today = date.today()
-                if date_posted > today:
-                    print(f"❌ Rejecting: Future date {date_posted} - {url[:50]}")
-                    return False
-                # Allow old dates (don't reject - might be reposted)
-            
-            # Job boards are trusted - accept everything else
-            print(f"✅ Accepting job board job: '{title}' at {company or 'Unknown'}")
-            return True
-        
-        # For non-job-board URLs, do basic validation
-        title_lower = title.lower()
-        
-        # Reject obviously non-job titles
-        if len(title.split()) < 2:  # Too short
-            print(f"❌ Rejecting: Title too short '{title}' - {url[:50]}")
-            return False
-        
+        is_job_board_url = _TRUSTED_BOARD_URL_RE.search(url) is not None
+
+        # Single linear pass: every check runs at most once. The two branches
+        # used to repeat the title/error-page/date scans; only the generic-title
+        # and unavailable patterns actually differ between trusted boards
+        # (lenient) and arbitrary URLs (strict), so just swap those in
+
         # Reject generic page titles and error pages
-        generic_titles = [
-            'homepage', 'home page', 'welcome', 'just a moment',
-            'sorry, you have been blocked', 'headlines', 'upcoming events',
-            'request blocked', 'help us protect', 'blocked', 'access denied',
-            'page not found', '404', 'error', 'forbidden', 'loading',
-            'redirecting', 'please wait', 'checking your browser'
-        ]
-        if any(generic in title_lower for generic in generic_titles):
-            print(f"❌ Rejecting: Generic/error title '{title}' - {url[:50]}")
+        generic_title_re = _GENERIC_PAGE_TITLE_RE if is_job_board_url else _GENERIC_TITLE_RE
+        if generic_title_re.search(title_lower):
+            print(f"❌ Rejecting: Generic/error page title '{title}' - {url[:50]}")
             return False
-        
+
         # Additional checks: reject titles that are clearly not job postings
-        non_job_patterns = [
-            'women in tech', 'event', 'workshop', 'conference', 'meetup',
-            'news', 'article', 'blog', 'story', 'press release',
-            'salary', 'interview', 'review', 'rating', 'comparison',
-            'guide', 'how to', 'tips', 'advice', 'career advice',
-            'resume template', 'cover letter template', 'sample'
-        ]
-        if any(pattern in title_lower for pattern in non_job_patterns):
+        if _NON_JOB_TITLE_RE.search(title_lower):
             print(f"❌ Rejecting: Non-job pattern in title '{title}' - {url[:50]}")
             return False
-        
-        # Reject if no company AND no job description
-        if not company and not jd_text:
-            print(f"❌ Rejecting: No company or description - {url[:50]}")
-            return False
-        
-        # Reject if company is "Company not specified" or similar
-        if company:
-            company_lower = company.lower()
-            if any(phrase in company_lower for phrase in ['not specified', 'not available', 'unknown', 'n/a', 'na']):
-                print(f"❌ Rejecting: Invalid company name '{company}' - {url[:50]}")
-                return False
-        
+
         # Reject titles that start with numbers (parsing errors like "33Data")
-        if title and len(title) > 0 and title[0].isdigit():
+        if title[0].isdigit():
+            # Check if it's a valid format (like "2024 Software Engineer") vs invalid ("33Data")
             words = title.split()
             if len(words) > 0 and words[0].isdigit() and len(words[0]) <= 2:
                 # Short number prefix (like "33") is likely a parsing error
                 print(f"❌ Rejecting: Invalid title format '{title}' - {url[:50]}")
                 return False
-        
+
         # Check HTML content for error indicators (including non-English)
-        if html:
-            html_lower = html.lower()
-            error_indicators = [
-                'page not found', '404', 'error', 'not found',
-                'لم يتم العثور',  # Arabic: "not found"
-                'صفحة غير موجودة',  # Arabic: "page not found"
-                'página no encontrada',  # Spanish
-                'seite nicht gefunden',  # German
-                'ページが見つかりません',  # Japanese
-                'страница не найдена'  # Russian
-            ]
-            if any(indicator in html_lower for indicator in error_indicators):
-                print(f"❌ Rejecting: Error page detected in HTML '{title}' - {url[:50]}")
-                return False
-        
-        # Check for unavailable jobs
-        if jd_text:
-            jd_lower = jd_text.lower()
-            unavailable_indicators = [
-                'no longer available', 'position has been filled', 'this job is closed',
-                'application closed', 'position closed', 'expired', 'unavailable'
-            ]
-            if any(indicator in jd_lower for indicator in unavailable_indicators):
-                print(f"❌ Rejecting: Unavailable job '{title}' - {url[:50]}")
-                return False
-        
-        # Check for future dates
+        if html and _ERROR_PAGE_RE.search(_window(html)):
+            print(f"❌ Rejecting: Error page detected in HTML '{title}' - {url[:50]}")
+            return False
+
+        # Check for unavailable jobs (boards get the wider pattern - "filled"
+        # etc. is unambiguous there)
+        unavailable_re = _JD_UNAVAILABLE_BOARD_RE if is_job_board_url else _JD_UNAVAILABLE_RE
+        if jd_text and unavailable_re.search(jd_text):
+            print(f"❌ Rejecting: Unavailable job '{title}' - {url[:50]}")
+            return False
+
+        # Check for future dates (parsing errors)
         date_posted = job_data.get("date_posted")
         if date_posted:
-            from datetime import date
-            today = date.today()
+            today = date_type.today()
             if date_posted > today:
                 print(f"❌ Rejecting: Future date {date_posted} - {url[:50]}")
                 return False
-        
+            # Allow old dates (don't reject - might be reposted)
+
+        # Job boards are trusted - accept everything else
+        if is_job_board_url:
+            print(f"✅ Accepting job board job: '{title}' at {company or 'Unknown'}")
+            return True
+
+        # For non-job-board URLs, do extra validation
+        # Reject obviously non-job titles
+        if len(title.split()) < 2:  # Too short
+            print(f"❌ Rejecting: Title too short '{title}' - {url[:50]}")
+            return False
+
+        # Reject if no company AND no job description
+        if not company and not jd_text:
+            print(f"❌ Rejecting: No company or description - {url[:50]}")
+            return False
+
+        # Reject if company is "Company not specified" or similar
+        if company and _INVALID_COMPANY_RE.search(company.lower()):
+            print(f"❌ Rejecting: Invalid company name '{company}' - {url[:50]}")
+            return False
+
         # Location filtering - if location specified, job must match OR be remote
         # Remote jobs are always included regardless of location filter
         if location_filter:
             is_remote_job = False
             if job_location:
-                job_location_lower = job_location.lower()
-                remote_indicators = ['remote', 'anywhere', 'work from home', 'wfh', 'virtual', 'distributed']
-                is_remote_job = any(indicator in job_location_lower for indicator in remote_indicators)
-            
+                # job_location is already lowercased above
+                is_remote_job = _REMOTE_LOCATION_RE.search(job_location) is not None
+
             # Also check job description for remote indicators
             if not is_remote_job and jd_text:
-                jd_lower = jd_text.lower()
-                remote_indicators = ['remote', 'anywhere', 'work from home', 'wfh', 'virtual', 'distributed', 'work remotely']
-                is_remote_job = any(indicator in jd_lower for indicator in remote_indicators)
+                is_remote_job = _REMOTE_JD_RE.search(jd_text) is not None
             
             # If it's a remote job, always include it (regardless of location filter)
             if is_remote_job:
@@ -573,35 +983,26 @@ class JobService:
             
             # If location filter specified and job is not remote, must match location
             location_filter_lower = location_filter.lower().strip()
-            # Normalize location filter (remove common variations)
-            location_variations = {
-                'new york': ['new york', 'ny', 'nyc', 'new york city', 'manhattan', 'brooklyn', 'queens', 'bronx', 'staten island'],
-                'california': ['california', 'ca', 'san francisco', 'sf', 'los angeles', 'la', 'san diego', 'palo alto', 'san jose', 'oakland'],
-                'chicago': ['chicago', 'il', 'illinois'],
-                'boston': ['boston', 'ma', 'massachusetts'],
-                'seattle': ['seattle', 'wa', 'washington'],
-                'texas': ['texas', 'tx', 'austin', 'dallas', 'houston'],
-                'florida': ['florida', 'fl', 'miami', 'tampa', 'orlando'],
-            }
-            
-            # Check if location filter matches any known variations
+
+            # Resolve the filter to a canonical region via the prebuilt
+            # reverse index (exact hit first, substring probe for filters like
+            # "new york city area")
+            canon = _VARIATION_TO_CANON.get(location_filter_lower)
+            if canon is None:
+                for var, region in _VARIATION_TO_CANON.items():
+                    if var in location_filter_lower:
+                        canon = region
+                        break
+
+            # One pass of the region's compiled alternation over the job
+            # location, falling back to the description
             matched_location = False
-            for key, variations in location_variations.items():
-                if location_filter_lower in variations or any(var in location_filter_lower for var in variations):
-                    # Check if job location matches any variation
-                    if job_location:
-                        for var in variations:
-                            if var in job_location:
-                                matched_location = True
-                                break
-                    # Also check in job description
-                    if jd_text:
-                        jd_lower = jd_text.lower()
-                        for var in variations:
-                            if var in jd_lower:
-                                matched_location = True
-                                break
-                    break
+            if canon:
+                loc_re = _LOC_RE[canon]
+                if job_location and loc_re.search(job_location):
+                    matched_location = True
+                elif jd_text and loc_re.search(jd_text):
+                    matched_location = True
             
             # If no match found, do simple substring check
             if not matched_location:
@@ -625,20 +1026,11 @@ class JobService:
             if len(part) > 2 and part in job_location:
                 return True
         
-        # Check for common abbreviations
-        location_abbrevs = {
-            'ny': 'new york',
-            'nyc': 'new york',
-            'ca': 'california',
-            'sf': 'san francisco',
-            'la': 'los angeles',
-            'il': 'illinois',
-            'ma': 'massachusetts',
-            'wa': 'washington',
-        }
-        
-        for abbrev, full in location_abbrevs.items():
-            if abbrev in filter_location and (full in job_location or abbrev in job_location):
+        # Check for common abbreviations - one scan of the filter string with
+        # the precompiled union instead of probing every abbreviation
+        for abbrev in _LOCATION_ABBREV_RE.findall(filter_location):
+            full = _LOCATION_ABBREVS[abbrev]
+            if full in job_location or abbrev in job_location:
                 return True
         
         return False
@@ -1,19 +1,55 @@
 from app.config import settings
-from app.utils.gemini_client import GeminiClient
+from app.utils.gemini_client import get_gemini_client
 from app.utils.resume_parser import ResumeParser
 from app.utils.pdf_parser import PDFParser
 from app.utils.pdf_to_latex import PDFToLaTeXConverter
 from typing import Dict, Any, Optional
+from functools import lru_cache
+import asyncio
+import hashlib
 import json
 import os
+import re
+import time
 import httpx
 
+
+# Client singletons - ProfileService is constructed per request, so the
+# heavyweight helpers (Gemini auth, PDF tooling) are built once and shared
+
+@lru_cache(maxsize=1)
+def _resume_parser() -> ResumeParser:
+    return ResumeParser()
+
+
+@lru_cache(maxsize=1)
+def _pdf_parser() -> PDFParser:
+    return PDFParser()
+
+
+@lru_cache(maxsize=1)
+def _pdf_to_latex() -> PDFToLaTeXConverter:
+    return PDFToLaTeXConverter()
+
+# Precompiled once - matches numbers, percentages and dollar amounts in bullets
+_METRIC_RE = re.compile(r'\d+%?|\$\d+[KM]?')
+
+# Embedding cache keyed by a hash of the embedding text - re-uploads of the
+# same resume (retries, dev loops) skip the embedding API call entirely
+_embedding_cache = {}
+_EMBEDDING_CACHE_MAX_SIZE = 64
+
+# PDF-to-LaTeX conversion cache keyed by PDF content hash - the conversion is
+# an expensive LLM-backed call and re-uploads of the same file are common
+_latex_template_cache = {}
+_LATEX_TEMPLATE_CACHE_MAX_SIZE = 32
+
 class ProfileService:
     def __init__(self):
-        self.gemini_client = GeminiClient()
-        self.parser = ResumeParser()
-        self.pdf_parser = PDFParser()
-        self.pdf_to_latex = PDFToLaTeXConverter()
+        self.gemini_client = get_gemini_client()
+        self.parser = _resume_parser()
+        self.pdf_parser = _pdf_parser()
+        self.pdf_to_latex = _pdf_to_latex()
     
     async def parse_resume(
         self,
@@ -28,27 +64,24 @@ class ProfileService:
         """Parse resume text or PDF and extract structured data"""
         resume_pdf_url = None
         resume_latex_template = None
-        temp_resume_json = None  # Will store parsed JSON if we parse it early
+        structured_resume = None  # Parsed exactly once, whichever branch runs
+        pdf_data = None
+        pdf_hash = None
         
         if resume_pdf_path and os.path.exists(resume_pdf_path):
+            # Hash the PDF bytes - identical uploads reuse the cached LaTeX
+            # conversion below
+            with open(resume_pdf_path, "rb") as f:
+                pdf_hash = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+            
             # Parse PDF
             pdf_data = await self.pdf_parser.parse_pdf(resume_pdf_path)
             resume_text = pdf_data["text"]
             resume_pdf_url = f"/uploads/resumes/{os.path.basename(resume_pdf_path)}"
             
-            # Parse resume JSON first (needed for LaTeX conversion)
-            temp_resume_json = await self.gemini_client.parse_resume(resume_text)
-            
-            # Convert PDF to LaTeX code preserving exact formatting
-            try:
-                resume_latex_template = await self.pdf_to_latex.convert_pdf_to_latex(
-                    pdf_path=resume_pdf_path,
-                    resume_json=temp_resume_json
-                )
-            except Exception as e:
-                print(f"Failed to convert PDF to LaTeX: {e}, using fallback")
-                # Fallback to basic template generation
-                resume_latex_template = await self._generate_latex_template_from_pdf(pdf_data)
+            # Parse resume JSON once - it feeds both the LaTeX conversion and
+            # the embedding below (previously this could re-enter Gemini)
+            structured_resume = await self.gemini_client.parse_resume(resume_text)
         
         elif resume_url:
             # Fetch resume from URL
@@ -56,21 +89,18 @@ class ProfileService:
                 response = await client.get(resume_url)
                 resume_text = response.text
         
-        # If no resume provided, generate one using AI
-        if not resume_text and not resume_pdf_path and not resume_url:
-            # Generate resume based on job profile
-            structured_resume = await self._generate_resume_from_profile(
-                role_target=role_target,
-                level_target=level_target,
-                name=name,
-                email=email
-            )
-        else:
-            # Parse resume using Gemini for structured extraction
-            # If we already parsed it for LaTeX conversion, reuse it
-            if temp_resume_json:
-                structured_resume = temp_resume_json
+        if structured_resume is None:
+            # If no resume provided, generate one using AI
+            if not resume_text and not resume_url:
+                # Generate resume based on job profile
+                structured_resume = await self._generate_resume_from_profile(
+                    role_target=role_target,
+                    level_target=level_target,
+                    name=name,
+                    email=email
+                )
             else:
+                # Parse resume using Gemini for structured extraction
                 structured_resume = await self.gemini_client.parse_resume(resume_text)
         
         # Extract skills, metrics, links
@@ -78,10 +108,47 @@ class ProfileService:
         metrics = self._extract_metrics(structured_resume)
         links = self._extract_links(structured_resume)
         
-        # Generate embedding vector (using Gemini or fallback)
-        resume_vector = await self.gemini_client.generate_embedding(
-            json.dumps(structured_resume)
-        )
+        async def _convert_to_latex() -> str:
+            # Same PDF bytes always convert to the same LaTeX - serve repeats
+            # from the cache
+            cached = _latex_template_cache.get(pdf_hash)
+            if cached is not None:
+                return cached[0]
+            
+            # Convert PDF to LaTeX code preserving exact formatting
+            try:
+                template = await self.pdf_to_latex.convert_pdf_to_latex(
+                    pdf_path=resume_pdf_path,
+                    resume_json=structured_resume
+                )
+            except Exception as e:
+                print(f"Failed to convert PDF to LaTeX: {e}, using fallback")
+                # Fallback to basic template generation (not cached - a retry
+                # should get another shot at the real conversion)
+                return await self._generate_latex_template_from_pdf(pdf_data)
+            
+            # Evict oldest entry if cache is full
+            if len(_latex_template_cache) >= _LATEX_TEMPLATE_CACHE_MAX_SIZE:
+                oldest_key = min(_latex_template_cache.keys(), key=lambda k: _latex_template_cache[k][1])
+                del _latex_template_cache[oldest_key]
+            _latex_template_cache[pdf_hash] = (template, time.time())
+            
+            return template
+        
+        # Compact, skills-first text for the embedding - raw json.dumps spends
+        # embedding input on braces, quotes and keys that carry no signal
+        embedding_text = self._build_embedding_text(structured_resume)
+        
+        if pdf_data is not None:
+            # LaTeX conversion and the embedding only depend on the parsed
+            # resume - run them concurrently
+            resume_latex_template, resume_vector = await asyncio.gather(
+                _convert_to_latex(),
+                self._generate_embedding_cached(embedding_text)
+            )
+        else:
+            # Generate embedding vector (using Gemini or fallback)
+            resume_vector = await self._generate_embedding_cached(embedding_text)
         
         return {
             "resume_json": structured_resume,
@@ -215,17 +282,60 @@ Make it realistic and professional. Match the role and level."""
         
         return template
     
+    def _build_embedding_text(self, resume_json: Dict[str, Any]) -> str:
+        """Build a compact text representation of a resume for embedding"""
+        parts = []
+        
+        skills = resume_json.get("skills", [])
+        if skills:
+            parts.append(" ".join(skills))
+        
+        if resume_json.get("summary"):
+            parts.append(resume_json["summary"])
+        
+        for exp in resume_json.get("experience", []):
+            header = " ".join(filter(None, [exp.get("title"), exp.get("company")]))
+            if header:
+                parts.append(header)
+            parts.extend(exp.get("bullets", []))
+        
+        for proj in resume_json.get("projects", []):
+            if proj.get("name"):
+                parts.append(proj["name"])
+            if proj.get("description"):
+                parts.append(proj["description"])
+            parts.extend(proj.get("bullets", []))
+        
+        return " ".join(parts)
+    
+    async def _generate_embedding_cached(self, text: str) -> Any:
+        """Generate an embedding, reusing cached vectors for identical text"""
+        cache_key = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+        cached = _embedding_cache.get(cache_key)
+        if cached is not None:
+            return cached[0]
+        
+        vector = await self.gemini_client.generate_embedding(text)
+        
+        # Evict oldest entry if cache is full
+        if len(_embedding_cache) >= _EMBEDDING_CACHE_MAX_SIZE:
+            oldest_key = min(_embedding_cache.keys(), key=lambda k: _embedding_cache[k][1])
+            del _embedding_cache[oldest_key]
+        _embedding_cache[cache_key] = (vector, time.time())
+        
+        return vector
+    
     def _extract_metrics(self, resume_json: Dict[str, Any]) -> Dict[str, Any]:
         """Extract quantitative metrics from resume"""
         metrics = {}
         for exp in resume_json.get("experience", []):
             bullets = exp.get("bullets", [])
             for bullet in bullets:
-                # Look for numbers and percentages
-                import re
-                numbers = re.findall(r'\d+%?|\$\d+[KM]?', bullet)
+                # Look for numbers and percentages, accumulating across all
+                # bullets for the company instead of keeping only the last one
+                numbers = _METRIC_RE.findall(bullet)
                 if numbers:
-                    metrics[exp.get("company", "")] = numbers
+                    metrics.setdefault(exp.get("company", ""), []).extend(numbers)
         return metrics
     
     def _extract_links(self, resume_json: Dict[str, Any]) -> Dict[str, str]:
@@ -1,30 +1,62 @@
 from app.config import settings
-from app.utils.gemini_client import GeminiClient
+from app.utils.gemini_client import get_gemini_client
 from app.utils.openai_client import OpenAIClient
 from app.utils.latex_generator import LaTeXGenerator
 from app.utils.latex_compiler import LaTeXCompiler
 from app.utils.pdf_generator import PDFGenerator
 from app.models import User, Job, TailoredAsset
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from functools import lru_cache
+import asyncio
+import hashlib
+import time
 import uuid
 import json
 import os
 
+# Compiled-PDF cache keyed by a hash of the LaTeX source - re-tailoring that
+# produces identical LaTeX (common on retries) skips the pdflatex run, which
+# is the slowest single step in the request
+_pdf_compile_cache = {}
+_PDF_COMPILE_CACHE_MAX_SIZE = 32
+
+
+# Client singletons - TailorService is constructed per request, so the
+# heavyweight helpers are built once and shared across requests
+
+@lru_cache(maxsize=1)
+def _openai_client() -> Optional[OpenAIClient]:
+    # Initialize OpenAI client only if API key is available
+    try:
+        return OpenAIClient()
+    except (ValueError, Exception):
+        print("OpenAI API key not configured, using Gemini only")
+        return None
+
+
+@lru_cache(maxsize=1)
+def _latex_generator() -> LaTeXGenerator:
+    return LaTeXGenerator()
+
+
+@lru_cache(maxsize=1)
+def _latex_compiler() -> LaTeXCompiler:
+    return LaTeXCompiler()
+
+
+@lru_cache(maxsize=1)
+def _pdf_generator() -> PDFGenerator:
+    return PDFGenerator()
+
 class TailorService:
     def __init__(self):
-        self.gemini_client = GeminiClient()
-        # Initialize OpenAI client only if API key is available
-        try:
-            self.openai_client = OpenAIClient()
-            self.use_openai = True
-        except (ValueError, Exception):
-            self.openai_client = None
-            self.use_openai = False
-            print("OpenAI API key not configured, using Gemini only")
-        self.latex_generator = LaTeXGenerator()
-        self.latex_compiler = LaTeXCompiler()
-        self.pdf_generator = PDFGenerator()  # Still used for cover letter
+        self.gemini_client = get_gemini_client()
+        self.openai_client = _openai_client()
+        self.use_openai = self.openai_client is not None
+        self.latex_generator = _latex_generator()
+        self.latex_compiler = _latex_compiler()
+        self.pdf_generator = _pdf_generator()  # Still used for cover letter
     
     async def generate_tailored_assets(
         self,
@@ -96,121 +128,163 @@ class TailorService:
         if base_resume_json.get("links"):
             tailored_resume["links"] = base_resume_json["links"]
         
-        # Generate cover letter using OpenAI (better quality) with Gemini fallback
-        if self.use_openai and self.openai_client:
-            try:
-                cover_letter = await self.openai_client.generate_cover_letter(
-                    resume_json=tailored_resume,
-                    job_description=job_description,
-                    company=job.company,
-                    jd_keywords=jd_keywords
-                )
-            except Exception as e:
-                print(f"OpenAI cover letter failed, falling back to Gemini: {e}")
-                cover_letter = await self.gemini_client.generate_cover_letter(
-                    resume_json=tailored_resume,
-                    job_description=job_description,
-                    company=job.company,
-                    jd_keywords=jd_keywords
-                )
-        else:
-            # Use Gemini if OpenAI not available
-            cover_letter = await self.gemini_client.generate_cover_letter(
+        async def _generate_cover_letter() -> Dict[str, Any]:
+            # Generate cover letter using OpenAI (better quality) with Gemini fallback
+            if self.use_openai and self.openai_client:
+                try:
+                    return await self.openai_client.generate_cover_letter(
+                        resume_json=tailored_resume,
+                        job_description=job_description,
+                        company=job.company,
+                        jd_keywords=jd_keywords
+                    )
+                except Exception as e:
+                    print(f"OpenAI cover letter failed, falling back to Gemini: {e}")
+            # Use Gemini if OpenAI not available (or it failed)
+            return await self.gemini_client.generate_cover_letter(
                 resume_json=tailored_resume,
                 job_description=job_description,
                 company=job.company,
                 jd_keywords=jd_keywords
             )
         
-        # Generate resume PDF using LaTeX (preserving original formatting)
-        original_latex_template = user.profile.resume_latex_template if user.profile else None
-        
-        # Generate LaTeX from tailored resume
-        try:
-            latex_content = await self.latex_generator.generate_latex(
-                resume_json=tailored_resume,
-                original_latex_template=original_latex_template
+        async def _generate_latex():
+            # Generate LaTeX from tailored resume (preserving original formatting)
+            original_latex_template = user.profile.resume_latex_template if user.profile else None
+            try:
+                return await self.latex_generator.generate_latex(
+                    resume_json=tailored_resume,
+                    original_latex_template=original_latex_template
+                )
+            except Exception as e:
+                print(f"Error generating LaTeX: {e}")
+                # Fallback to ReportLab if LaTeX generation fails
+                return None
+        
+        # The cover letter, LaTeX generation and the three AI-insight calls all
+        # depend only on the tailored resume - run them as one concurrent wave
+        # instead of five sequential model roundtrips
+        (cover_letter, latex_content, ai_explanation, ai_recommendations,
+         match_score) = await asyncio.gather(
+            _generate_cover_letter(),
+            _generate_latex(),
+            self.gemini_client.generate_ai_explanation(
+                base_resume_json,
+                tailored_resume,
+                job_description,
+                jd_keywords
+            ),
+            self.gemini_client.generate_ai_recommendations(
+                tailored_resume,
+                job_description
+            ),
+            self.gemini_client.calculate_job_match_score(
+                tailored_resume,
+                job_description,
+                jd_keywords
             )
-        except Exception as e:
-            print(f"Error generating LaTeX: {e}")
-            # Fallback to ReportLab if LaTeX generation fails
-            latex_content = None
+        )
         
-        # Compile LaTeX to PDF
         uploads_dir = "uploads/pdfs"
         os.makedirs(uploads_dir, exist_ok=True)
-        resume_pdf_output = os.path.join(uploads_dir, f"resume_{user.id}_{job.id}.pdf")
         
-        resume_pdf_path = None
-        if latex_content:
-            try:
-                resume_pdf_path = await self.latex_compiler.compile_latex_to_pdf(
-                    latex_content=latex_content,
-                    output_filename=resume_pdf_output
-                )
-            except (RuntimeError, FileNotFoundError, Exception) as e:
-                print(f"LaTeX compilation failed: {e}, falling back to ReportLab")
-                resume_pdf_path = None
-        
-        # Fallback to ReportLab if LaTeX compilation fails or wasn't attempted
-        if not resume_pdf_path:
-            try:
-                resume_pdf_path = await self.pdf_generator.generate_resume_pdf(tailored_resume)
-                # If PDF is already in uploads directory, use it directly
-                if os.path.dirname(resume_pdf_path) == uploads_dir:
-                    resume_pdf_output = resume_pdf_path
-                else:
-                    resume_pdf_output = os.path.join(uploads_dir, f"resume_{user.id}_{job.id}.pdf")
-                    import shutil
-                    if os.path.exists(resume_pdf_path) and resume_pdf_path != resume_pdf_output:
-                        shutil.copy2(resume_pdf_path, resume_pdf_output)
-                    elif resume_pdf_path == resume_pdf_output:
-                        # Already in the right place, no need to copy
-                        pass
+        async def _build_resume_pdf() -> str:
+            # Compile LaTeX to PDF
+            resume_pdf_output = os.path.join(uploads_dir, f"resume_{user.id}_{job.id}.pdf")
+            
+            resume_pdf_path = None
+            if latex_content:
+                latex_key = hashlib.blake2b(latex_content.encode(), digest_size=16).hexdigest()
+                cached = _pdf_compile_cache.get(latex_key)
+                if cached is not None and os.path.exists(cached[0]):
+                    # Identical LaTeX was compiled before - link the existing
+                    # PDF into place instead of running pdflatex again
+                    if os.path.abspath(cached[0]) != os.path.abspath(resume_pdf_output):
+                        try:
+                            if os.path.exists(resume_pdf_output):
+                                os.remove(resume_pdf_output)
+                            os.link(cached[0], resume_pdf_output)
+                        except OSError:
+                            import shutil
+                            shutil.copy2(cached[0], resume_pdf_output)
+                    return resume_pdf_output
+                try:
+                    resume_pdf_path = await self.latex_compiler.compile_latex_to_pdf(
+                        latex_content=latex_content,
+                        output_filename=resume_pdf_output
+                    )
+                except (RuntimeError, FileNotFoundError, Exception) as e:
+                    print(f"LaTeX compilation failed: {e}, falling back to ReportLab")
+                    resume_pdf_path = None
+                if resume_pdf_path:
+                    # Drop stale entries pointing at this output path (the file
+                    # was just overwritten), then record the fresh compile
+                    for key in [k for k, v in _pdf_compile_cache.items() if v[0] == resume_pdf_output]:
+                        del _pdf_compile_cache[key]
+                    if len(_pdf_compile_cache) >= _PDF_COMPILE_CACHE_MAX_SIZE:
+                        oldest_key = min(_pdf_compile_cache.keys(), key=lambda k: _pdf_compile_cache[k][1])
+                        del _pdf_compile_cache[oldest_key]
+                    _pdf_compile_cache[latex_key] = (resume_pdf_output, time.time())
+            
+            # Fallback to ReportLab if LaTeX compilation fails or wasn't attempted
+            if not resume_pdf_path:
+                try:
+                    resume_pdf_path = await self.pdf_generator.generate_resume_pdf(tailored_resume)
+                    # If PDF is already in uploads directory, use it directly
+                    if os.path.dirname(resume_pdf_path) == uploads_dir:
+                        resume_pdf_output = resume_pdf_path
                     else:
-                        raise ValueError(f"PDF generation failed: {resume_pdf_path} does not exist")
+                        resume_pdf_output = os.path.join(uploads_dir, f"resume_{user.id}_{job.id}.pdf")
+                        if os.path.exists(resume_pdf_path) and resume_pdf_path != resume_pdf_output:
+                            # The ReportLab output is disposable - rename it
+                            # into place instead of copying (copy only if the
+                            # uploads dir is on a different filesystem)
+                            try:
+                                os.replace(resume_pdf_path, resume_pdf_output)
+                            except OSError:
+                                import shutil
+                                shutil.copy2(resume_pdf_path, resume_pdf_output)
+                        elif resume_pdf_path == resume_pdf_output:
+                            # Already in the right place, no need to copy
+                            pass
+                        else:
+                            raise ValueError(f"PDF generation failed: {resume_pdf_path} does not exist")
+                except Exception as e:
+                    raise ValueError(f"Failed to generate resume PDF: {str(e)}")
+            return resume_pdf_output
+        
+        async def _build_cover_pdf() -> str:
+            # Generate cover letter PDF (using ReportLab for now)
+            try:
+                return await self.pdf_generator.generate_cover_letter_pdf(cover_letter)
             except Exception as e:
-                raise ValueError(f"Failed to generate resume PDF: {str(e)}")
+                raise ValueError(f"Failed to generate cover letter PDF: {str(e)}")
         
-        # Generate cover letter PDF (using ReportLab for now)
-        try:
-            cover_pdf_path = await self.pdf_generator.generate_cover_letter_pdf(cover_letter)
-        except Exception as e:
-            raise ValueError(f"Failed to generate cover letter PDF: {str(e)}")
+        # Both PDFs are independent subprocess/IO-bound work - build them together
+        resume_pdf_output, cover_pdf_path = await asyncio.gather(
+            _build_resume_pdf(),
+            _build_cover_pdf()
+        )
         
-        # Store PDFs and get URLs
+        # Store PDFs and get URLs - the filesystem syscalls run in a worker
+        # thread so they don't block the event loop
         try:
-            resume_pdf_url = self._store_pdf(resume_pdf_output, f"resume_{user.id}_{job.id}.pdf")
+            resume_pdf_url = await asyncio.to_thread(
+                self._store_pdf, resume_pdf_output, f"resume_{user.id}_{job.id}.pdf"
+            )
         except Exception as e:
             raise ValueError(f"Failed to store resume PDF: {str(e)}")
-        
+
         try:
-            cover_pdf_url = self._store_pdf(cover_pdf_path, f"cover_{user.id}_{job.id}.pdf")
+            cover_pdf_url = await asyncio.to_thread(
+                self._store_pdf, cover_pdf_path, f"cover_{user.id}_{job.id}.pdf"
+            )
         except Exception as e:
             raise ValueError(f"Failed to store cover letter PDF: {str(e)}")
         
         # Calculate diffs
         diffs = self._calculate_diffs(base_resume_json, tailored_resume)
         
-        # Generate AI explanations and insights using Gemini
-        ai_explanation = await self.gemini_client.generate_ai_explanation(
-            base_resume_json,
-            tailored_resume,
-            job_description,
-            jd_keywords
-        )
-        
-        ai_recommendations = await self.gemini_client.generate_ai_recommendations(
-            tailored_resume,
-            job_description
-        )
-        
-        match_score = await self.gemini_client.calculate_job_match_score(
-            tailored_resume,
-            job_description,
-            jd_keywords
-        )
-        
         # Add AI insights to diffs
         diffs["ai_explanation"] = ai_explanation
         diffs["ai_recommendations"] = ai_recommendations
@@ -249,14 +323,23 @@ class TailorService:
         for i, (base_job, tailored_job) in enumerate(zip(base_exp, tailored_exp)):
             base_bullets = base_job.get("bullets", [])
             tailored_bullets = tailored_job.get("bullets", [])
-            
-            if base_bullets != tailored_bullets:
-                diffs["bullets_changed"].append({
-                    "job_index": i,
-                    "company": base_job.get("company"),
-                    "base_bullets": base_bullets,
-                    "tailored_bullets": tailored_bullets
-                })
+
+            # Cheap hash precompare first - most experience blocks come back
+            # untouched, so skip the element-wise string comparison for them
+            if hash(tuple(base_bullets)) == hash(tuple(tailored_bullets)) \
+                    and base_bullets == tailored_bullets:
+                continue
+
+            # Record only the bullets that actually changed instead of both
+            # full lists - keeps the stored diff payload small
+            base_set = set(base_bullets)
+            tailored_set = set(tailored_bullets)
+            diffs["bullets_changed"].append({
+                "job_index": i,
+                "company": base_job.get("company"),
+                "added": [b for b in tailored_bullets if b not in base_set],
+                "removed": [b for b in base_bullets if b not in tailored_set]
+            })
         
         # Check if sections were reordered
         base_keys = list(base.keys())
@@ -287,12 +370,18 @@ class TailorService:
             print(f"PDF already in correct location: {pdf_path}")
             return f"/uploads/pdfs/{filename}"
         
-        # Copy file to destination
-        import shutil
+        # Hardlink into place when possible - same filesystem, zero-copy and
+        # atomic. Fall back to a full copy for cross-device moves
         try:
-            shutil.copy2(pdf_path, dest_path)
-        except Exception as e:
-            raise RuntimeError(f"Failed to copy PDF file: {str(e)}")
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+            os.link(pdf_path, dest_path)
+        except OSError:
+            import shutil
+            try:
+                shutil.copy2(pdf_path, dest_path)
+            except Exception as e:
+                raise RuntimeError(f"Failed to copy PDF file: {str(e)}")
         
         # Return relative URL (in production, return S3 URL)
         return f"/uploads/pdfs/{filename}"
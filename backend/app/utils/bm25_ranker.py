@@ -1,10 +1,99 @@
 """
 BM25 (Best Matching 25) ranking algorithm for job search relevance
 """
+import hashlib
+import os
 import re
-from typing import List, Dict, Any
+import tempfile
+import time
+from typing import List, Dict, Any, Tuple
 from collections import Counter
-import math
+
+import numpy as np
+
+# Fitted-index cache shared across ranker instances (a fresh BM25Ranker is
+# created per search request). Keyed by a fingerprint of the job corpus so
+# repeat searches over the same job set skip re-tokenizing everything
+_fit_cache = {}
+_FIT_CACHE_MAX_SIZE = 8
+
+# On-disk copy of the most recently fitted index so a worker restart doesn't
+# force a cold refit over the whole corpus on the first search
+_INDEX_PATH = os.path.join(tempfile.gettempdir(), "hack-a-job-bm25-index.npz")
+
+# Precompiled tokenizer pattern - _tokenize runs once per document per fit
+# plus once per query, so skip the re-cache lookup on every call
+_TOKEN_RE = re.compile(r'\b[a-z0-9]+\b')
+
+
+def _save_index(fingerprint: str, state: tuple) -> None:
+    """Persist a fitted index to disk (atomic via tmp file + rename)"""
+    num_docs, vocab, idf, avg_doc_len, doc_lengths, len_norm, postings = state
+    try:
+        # Flatten the per-term posting lists into CSC-style flat arrays with
+        # an indptr so everything fits in one savez call
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        doc_id_chunks = []
+        tf_chunks = []
+        for term_id in range(len(vocab)):
+            doc_ids, tfs = postings[term_id]
+            indptr[term_id + 1] = indptr[term_id] + len(doc_ids)
+            doc_id_chunks.append(doc_ids)
+            tf_chunks.append(tfs)
+        terms = np.array(sorted(vocab, key=vocab.get))
+        
+        tmp_path = _INDEX_PATH + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                fingerprint=np.array(fingerprint),
+                num_docs=np.array(num_docs),
+                avg_doc_len=np.array(avg_doc_len),
+                terms=terms,
+                idf=idf,
+                doc_lengths=doc_lengths,
+                len_norm=len_norm,
+                indptr=indptr,
+                doc_ids=np.concatenate(doc_id_chunks) if doc_id_chunks else np.empty(0, dtype=np.int32),
+                tfs=np.concatenate(tf_chunks) if tf_chunks else np.empty(0)
+            )
+        os.replace(tmp_path, _INDEX_PATH)
+    except Exception as e:
+        print(f"❌ Failed to persist BM25 index: {e}")
+
+
+def _load_index():
+    """Load the persisted index, returning (fingerprint, state) or None"""
+    if not os.path.exists(_INDEX_PATH):
+        return None
+    try:
+        with np.load(_INDEX_PATH, allow_pickle=False) as data:
+            fingerprint = data["fingerprint"].item()
+            terms = data["terms"]
+            vocab = {str(term): term_id for term_id, term in enumerate(terms)}
+            indptr = data["indptr"]
+            doc_ids = data["doc_ids"]
+            tfs = data["tfs"]
+            postings = {
+                term_id: (doc_ids[indptr[term_id]:indptr[term_id + 1]],
+                          tfs[indptr[term_id]:indptr[term_id + 1]])
+                for term_id in range(len(terms))
+            }
+            state = (int(data["num_docs"]), vocab, data["idf"],
+                     float(data["avg_doc_len"]), data["doc_lengths"],
+                     data["len_norm"], postings)
+            return fingerprint, state
+    except Exception as e:
+        print(f"❌ Failed to load BM25 index from disk: {e}")
+        return None
+
+
+def _corpus_fingerprint(jobs: List[Any]) -> str:
+    """Fingerprint a job list by id + created_at (order-sensitive)"""
+    hasher = hashlib.blake2b(digest_size=16)
+    for job in jobs:
+        hasher.update(f"{job.id}:{job.created_at}".encode())
+    return hasher.hexdigest()
 
 
 class BM25Ranker:
@@ -23,49 +112,55 @@ class BM25Ranker:
         """
         self.k1 = k1
         self.b = b
-        self.documents = []
-        self.doc_freqs = []
-        self.idf = {}
-        self.avg_doc_len = 0
-        self.doc_lengths = []
+        self.num_docs = 0
+        self.vocab = {}  # term -> term id (column index into idf)
+        self.idf = np.empty(0)
+        self.avg_doc_len = 0.0
+        self.doc_lengths = np.empty(0)
+        # k1 * ((1 - b) + b * doc_len / avg_doc_len) per document, precomputed
+        # in fit() - it depends only on the document, never the query
+        self._len_norm = np.empty(0)
+        # term id -> (doc index array, term frequency array), both sorted by
+        # doc index. Compact NumPy posting lists instead of a Counter per doc
+        self._postings: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
     
     def _tokenize(self, text: str) -> List[str]:
         """Tokenize text into words (lowercase, alphanumeric only)"""
         if not text:
             return []
         # Convert to lowercase and extract words
-        words = re.findall(r'\b[a-z0-9]+\b', text.lower())
+        words = _TOKEN_RE.findall(text.lower())
         return words
     
-    def _get_document_text(self, job: Any) -> str:
+    def _get_document_fields(self, job: Any) -> List[Tuple[str, int]]:
         """
-        Extract searchable text from a job object.
-        Combines title, company, location, description, and keywords with weights.
+        Extract searchable (text, weight) fields from a job object.
+        Weights replace the old "repeat the string N times" trick - the term
+        counts are simply multiplied during fit, with no string duplication.
         """
-        parts = []
+        fields = []
         
-        # Title (highest weight - repeat 3x)
+        # Title (highest weight)
         if job.title:
-            parts.extend([job.title] * 3)
+            fields.append((job.title, 3))
         
-        # Company name (medium weight - repeat 2x)
+        # Company name (medium weight)
         if job.company:
-            parts.extend([job.company] * 2)
+            fields.append((job.company, 2))
         
-        # Location (medium weight - repeat 2x)
+        # Location (medium weight)
         if job.location:
-            parts.extend([job.location] * 2)
+            fields.append((job.location, 2))
         
         # Job description (full weight)
         if job.jd_text:
-            parts.append(job.jd_text)
+            fields.append((job.jd_text, 1))
         
-        # Keywords (high weight - repeat 2x each)
+        # Keywords (high weight)
         if job.jd_keywords:
-            for keyword in job.jd_keywords:
-                parts.extend([keyword] * 2)
+            fields.append((" ".join(job.jd_keywords), 2))
         
-        return " ".join(parts)
+        return fields
     
     def fit(self, jobs: List[Any]):
         """
@@ -75,43 +170,68 @@ class BM25Ranker:
         Args:
             jobs: List of Job objects to index
         """
-        self.documents = []
-        self.doc_lengths = []
-        
-        # Tokenize all documents
+        doc_counts = []
+        doc_lengths = []
+        vocab = {}
+        df_counter = Counter()
+
+        # Single pass: tokenize each field once, scale its counts by the
+        # field weight, and accumulate document frequencies and the
+        # vocabulary together
         for job in jobs:
-            doc_text = self._get_document_text(job)
-            tokens = self._tokenize(doc_text)
-            self.documents.append(tokens)
-            self.doc_lengths.append(len(tokens))
-        
-        # Calculate average document length
-        if self.doc_lengths:
-            self.avg_doc_len = sum(self.doc_lengths) / len(self.doc_lengths)
+            counts = Counter()
+            doc_len = 0
+            for text, weight in self._get_document_fields(job):
+                tokens = self._tokenize(text)
+                doc_len += weight * len(tokens)
+                if weight == 1:
+                    counts.update(tokens)
+                else:
+                    for token in tokens:
+                        counts[token] += weight
+            doc_counts.append(counts)
+            doc_lengths.append(doc_len)
+            df_counter.update(counts.keys())
+            for term in counts:
+                if term not in vocab:
+                    vocab[term] = len(vocab)
+
+        self.vocab = vocab
+        self.num_docs = len(doc_counts)
+        self.doc_lengths = np.asarray(doc_lengths, dtype=np.float64)
+        self.avg_doc_len = float(self.doc_lengths.mean()) if self.num_docs else 0.0
+
+        # Precompute the BM25 length-normalization denominator term once per
+        # document instead of once per (term, document) pair during scoring
+        if self.avg_doc_len > 0:
+            self._len_norm = self.k1 * ((1 - self.b) + self.b * (self.doc_lengths / self.avg_doc_len))
         else:
-            self.avg_doc_len = 0
-        
-        # Calculate document frequencies (how many docs contain each term)
-        self.doc_freqs = []
-        all_terms = set()
-        
-        for doc_tokens in self.documents:
-            term_counts = Counter(doc_tokens)
-            self.doc_freqs.append(term_counts)
-            all_terms.update(doc_tokens)
-        
+            self._len_norm = np.full(self.num_docs, self.k1)
+
         # Calculate IDF (Inverse Document Frequency) for each term
         # Standard BM25 IDF formula: log((N - df + 0.5) / (df + 0.5))
-        num_docs = len(self.documents)
-        for term in all_terms:
-            # Count how many documents contain this term (document frequency)
-            doc_count = sum(1 for df in self.doc_freqs if term in df)
-            # BM25 IDF formula with smoothing
-            if doc_count == 0:
-                idf_value = math.log(num_docs + 0.5)
-            else:
-                idf_value = math.log((num_docs - doc_count + 0.5) / (doc_count + 0.5))
-            self.idf[term] = idf_value
+        # One vectorized np.log over the whole document-frequency vector
+        # instead of a per-term Python loop that rescanned every document
+        df = np.zeros(len(vocab), dtype=np.float64)
+        for term, doc_count in df_counter.items():
+            df[vocab[term]] = doc_count
+        self.idf = np.log((self.num_docs - df + 0.5) / (df + 0.5))
+
+        # Build per-term posting lists: for each term, which documents contain
+        # it and with what frequency. Doc indices come out sorted because we
+        # iterate documents in order
+        postings = {}
+        for doc_idx, counts in enumerate(doc_counts):
+            for term, tf in counts.items():
+                entry = postings.get(vocab[term])
+                if entry is None:
+                    entry = postings[vocab[term]] = ([], [])
+                entry[0].append(doc_idx)
+                entry[1].append(tf)
+        self._postings = {
+            term_id: (np.asarray(doc_ids, dtype=np.int32), np.asarray(tfs, dtype=np.float64))
+            for term_id, (doc_ids, tfs) in postings.items()
+        }
     
     def score(self, query: str, doc_index: int) -> float:
         """
@@ -124,25 +244,26 @@ class BM25Ranker:
         Returns:
             BM25 relevance score
         """
-        if doc_index >= len(self.documents):
+        if doc_index >= self.num_docs:
             return 0.0
         
         query_terms = self._tokenize(query)
-        doc_tokens = self.documents[doc_index]
-        doc_len = self.doc_lengths[doc_index]
-        term_freqs = self.doc_freqs[doc_index]
+        doc_len = float(self.doc_lengths[doc_index])
         
         score = 0.0
         
         for term in query_terms:
-            if term not in self.idf:
+            term_id = self.vocab.get(term)
+            if term_id is None:
                 continue
             
-            # Term frequency in this document
-            tf = term_freqs.get(term, 0)
-            
-            if tf == 0:
+            # Term frequency in this document - posting lists are sorted by
+            # doc index, so a binary search finds it
+            doc_ids, tfs = self._postings[term_id]
+            pos = int(np.searchsorted(doc_ids, doc_index))
+            if pos >= len(doc_ids) or doc_ids[pos] != doc_index:
                 continue
+            tf = float(tfs[pos])
             
             # Standard BM25 formula:
             # score = IDF(term) * (tf * (k1 + 1)) / (tf + k1 * ((1 - b) + b * (doc_len / avg_doc_len)))
@@ -153,20 +274,44 @@ class BM25Ranker:
             # - b = length normalization (default 0.75)
             # - doc_len = document length
             # - avg_doc_len = average document length
-            idf = self.idf[term]
+            idf = float(self.idf[term_id])
             numerator = tf * (self.k1 + 1)
-            # Normalize document length
-            if self.avg_doc_len > 0:
-                length_norm = (1 - self.b) + self.b * (doc_len / self.avg_doc_len)
-            else:
-                length_norm = 1.0
-            denominator = tf + self.k1 * length_norm
+            # Document length normalization was precomputed in fit()
+            denominator = tf + float(self._len_norm[doc_index])
             
             # Sum scores for all query terms
             score += idf * (numerator / denominator)
         
         return score
-    
+
+    def score_all(self, query: str) -> np.ndarray:
+        """
+        Calculate BM25 scores for a query against every fitted document at once.
+
+        Args:
+            query: Search query string
+
+        Returns:
+            ndarray of shape (num_docs,) with one score per document
+        """
+        scores = np.zeros(self.num_docs, dtype=np.float64)
+        if not self.num_docs:
+            return scores
+
+        for term in self._tokenize(query):
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                continue
+            # Same BM25 formula as score(), applied to the term's whole
+            # posting list in one vectorized expression; the length
+            # normalization was precomputed in fit()
+            doc_ids, tfs = self._postings[term_id]
+            scores[doc_ids] += float(self.idf[term_id]) * (tfs * (self.k1 + 1)) / (
+                tfs + self._len_norm[doc_ids]
+            )
+
+        return scores
+
     def rank(self, jobs: List[Any], query: str, top_k: int = None) -> List[tuple]:
         """
         Rank jobs by relevance to query using BM25.
@@ -179,23 +324,47 @@ class BM25Ranker:
         Returns:
             List of tuples (job, score) sorted by score (descending)
         """
-        # Fit the model on the jobs
-        self.fit(jobs)
-        
-        # Score each job
-        scored_jobs = []
-        for idx, job in enumerate(jobs):
-            score = self.score(query, idx)
-            scored_jobs.append((job, score))
-        
+        # Fit the model on the jobs, reusing a previously fitted index when
+        # the exact same corpus was ranked before (only the query changed)
+        fingerprint = _corpus_fingerprint(jobs)
+        cached = _fit_cache.get(fingerprint)
+        if cached is None:
+            # Cold in-process cache: the index persisted by a previous worker
+            # run may still match this corpus
+            loaded = _load_index()
+            if loaded is not None and loaded[0] == fingerprint:
+                cached = (loaded[1], time.time())
+                _fit_cache[fingerprint] = cached
+        if cached is not None:
+            (self.num_docs, self.vocab, self.idf, self.avg_doc_len,
+             self.doc_lengths, self._len_norm, self._postings) = cached[0]
+        else:
+            self.fit(jobs)
+            state = (self.num_docs, self.vocab, self.idf, self.avg_doc_len,
+                     self.doc_lengths, self._len_norm, self._postings)
+            # Evict oldest entry if cache is full
+            if len(_fit_cache) >= _FIT_CACHE_MAX_SIZE:
+                oldest_key = min(_fit_cache.keys(), key=lambda k: _fit_cache[k][1])
+                del _fit_cache[oldest_key]
+            _fit_cache[fingerprint] = (state, time.time())
+            _save_index(fingerprint, state)
+
+        # Score all jobs in one vectorized pass
+        scores = self.score_all(query)
+
+        if top_k and top_k < len(jobs):
+            # Partial selection: argpartition finds the top K in O(N), then
+            # only those K results get sorted (instead of the whole corpus).
+            # Zero/negative scores are still dropped - jobs with no matching
+            # terms should not appear in results
+            top_idx = np.argpartition(scores, -top_k)[-top_k:]
+            top_idx = top_idx[np.argsort(-scores[top_idx])]
+            return [(jobs[i], float(scores[i])) for i in top_idx if scores[i] > 0]
+
         # Sort by score (descending), but filter out jobs with zero or negative scores
         # (jobs with no matching terms should not appear in results)
-        scored_jobs = [(job, score) for job, score in scored_jobs if score > 0]
+        scored_jobs = [(job, float(score)) for job, score in zip(jobs, scores) if score > 0]
         scored_jobs.sort(key=lambda x: x[1], reverse=True)
-        
-        # Return top K if specified
-        if top_k:
-            return scored_jobs[:top_k]
-        
+
         return scored_jobs
 
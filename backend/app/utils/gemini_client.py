@@ -1,35 +1,288 @@
 from app.config import settings
 import google.generativeai as genai
 from typing import Dict, Any, List
-import json
+import copy
+import hashlib
+import orjson
+import numpy as np
 import asyncio
+import jinja2
+import os
+import random
+import sqlite3
+import tempfile
 import time
 import re
-from google.api_core import retry
+from google.api_core import exceptions as google_exceptions
+
+# Content-addressed response cache shared across client instances. The prompt
+# fully determines the work, so identical prompts (same resume + JD pair -
+# common when users preview, tweak and re-render) skip the model call
+_response_cache = {}
+_RESPONSE_CACHE_TTL = 24 * 3600  # 24 hours
+_RESPONSE_CACHE_MAX_SIZE = 512
+
+# Bump when prompt wording changes - it is part of the cache key, so stale
+# responses generated by old prompts invalidate themselves
+_PROMPT_VERSION = "v1"
+
+# Persistent second tier behind the in-memory cache: survives restarts and
+# deploys, so repeat resume/JD pairs skip the model call across processes too
+_CACHE_DB_PATH = os.path.join(tempfile.gettempdir(), "hack-a-job-gemini-cache.sqlite3")
+_CACHE_DB_TTL = 7 * 86400  # 7 days
+
+def _cache_db_get(key: str):
+    """Read a persisted response; returns None on miss, expiry or any error"""
+    try:
+        with sqlite3.connect(_CACHE_DB_PATH) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value BLOB, created REAL)")
+            row = conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if time.time() - row[1] > _CACHE_DB_TTL:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            return orjson.loads(row[0])
+    except Exception as e:
+        print(f"⚠️  Gemini cache read failed: {e}")
+        return None
+
+def _cache_db_set(key: str, result) -> None:
+    """Persist a response; failures only cost the cache, never the call"""
+    try:
+        with sqlite3.connect(_CACHE_DB_PATH) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value BLOB, created REAL)")
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created) VALUES (?, ?, ?)",
+                (key, orjson.dumps(result), time.time())
+            )
+    except Exception as e:
+        print(f"⚠️  Gemini cache write failed: {e}")
+
+# Markdown code fences the model wraps JSON responses in
+_FENCE_RE = re.compile(r'\A```(?:json)?\s*|\s*```\Z')
+
+# Style rules enforced deterministically after the response instead of spending
+# prompt tokens asking the model to follow them probabilistically
+_STYLE_FIXES = [
+    (re.compile(r'\s*[—–]\s*'), ', '),  # em/en dashes -> comma
+    (re.compile(r';'), '.'),             # semicolons -> period
+    (re.compile(r'!'), '.'),             # no exclamation points
+]
+
+def _apply_style(value):
+    """Recursively apply the style fixes to every string in a payload"""
+    if isinstance(value, str):
+        for pattern, replacement in _STYLE_FIXES:
+            value = pattern.sub(replacement, value)
+        return value
+    if isinstance(value, list):
+        return [_apply_style(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _apply_style(item) for key, item in value.items()}
+    return value
+
+class _TokenBucket:
+    """Minimal async token bucket so requests queue in-process instead of
+    hitting the API over quota and burning a round-trip on the 429."""
+
+    def __init__(self, max_rate: int, time_period: float = 60.0):
+        self.max_rate = float(max_rate)
+        self.refill_per_sec = max_rate / time_period
+        self.tokens = float(max_rate)
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.max_rate,
+                    self.tokens + (now - self.last_refill) * self.refill_per_sec
+                )
+                self.last_refill = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.refill_per_sec)
+
+# Shared across client instances - the quota is per API key, not per client
+_rate_limiter = _TokenBucket(settings.gemini_qpm)
+
+# Bounds in-flight requests (the bucket bounds rate, not concurrency) so a
+# burst of gathered calls can't pile hundreds of simultaneous connections
+_request_semaphore = asyncio.Semaphore(10)
+
+def _trim_resume_json(resume_json: Dict[str, Any], budget: int) -> str:
+    """Serialize a resume compactly, dropping whole sections to fit a budget.
+
+    The old [:N] character slices chopped mid-key and spent ~25% of the
+    budget on indent whitespace. This serializes compactly and keeps whole
+    sections in priority order (experience > skills > projects > education)
+    so the prompt always carries valid, high-signal JSON. The budget is in
+    characters (roughly 4 per token for English JSON).
+    """
+    full = orjson.dumps(resume_json).decode()
+    if len(full) <= budget:
+        return full
+    
+    # Contact details and summary are small and always kept
+    trimmed = {
+        key: value
+        for key, value in resume_json.items()
+        if key not in ("experience", "skills", "projects", "education")
+    }
+    for section in ("experience", "skills", "projects", "education"):
+        if section in resume_json:
+            trimmed[section] = resume_json[section]
+            if len(orjson.dumps(trimmed)) > budget:
+                del trimmed[section]
+    return orjson.dumps(trimmed).decode()
+
+
+# Static prompt pieces frozen at import time - rebuilding (and re-serializing)
+# them per call wastes allocations for text that never changes
+_RESUME_SCHEMA = {
+    "type": "object",
+    "required": ["summary", "skills", "experience", "projects", "education"],
+    "properties": {
+        "summary": {"type": "string", "maxLength": 500},
+        "skills": {"type": "array", "items": {"type": "string"}},
+        "experience": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["company", "title", "start", "bullets"],
+                "properties": {
+                    "company": {"type": "string"},
+                    "title": {"type": "string"},
+                    "start": {"type": "string"},
+                    "end": {"type": ["string", "null"]},
+                    "bullets": {"type": "array", "items": {"type": "string"}}
+                }
+            }
+        },
+        "projects": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["name", "bullets"],
+                "properties": {
+                    "name": {"type": "string"},
+                    "bullets": {"type": "array", "items": {"type": "string"}}
+                }
+            }
+        },
+        "education": {
+            "type": "array",
+            "items": {"type": "object"}
+        }
+    }
+}
+_RESUME_SCHEMA_JSON = orjson.dumps(_RESUME_SCHEMA, option=orjson.OPT_INDENT_2).decode()
+
+def _validate_resume_shape(resume: Any) -> None:
+    """Structural validation of a parsed resume against _RESUME_SCHEMA.
+
+    Straight-line isinstance checks - the schema is small and fixed, so
+    this catches malformed model output in microseconds before it poisons
+    downstream tailoring and rendering. Raises ValueError with the
+    violation so the caller can retry with a corrective prompt.
+    """
+    if not isinstance(resume, dict):
+        raise ValueError(f"resume must be a JSON object, got {type(resume).__name__}")
+    missing = [field for field in _RESUME_SCHEMA["required"] if field not in resume]
+    if missing:
+        raise ValueError(f"resume is missing required fields: {', '.join(missing)}")
+    if not isinstance(resume["summary"], str):
+        raise ValueError("summary must be a string")
+    for field in ("skills", "experience", "projects", "education"):
+        if not isinstance(resume[field], list):
+            raise ValueError(f"{field} must be a list")
+    for exp in resume["experience"]:
+        if not isinstance(exp, dict) or not isinstance(exp.get("bullets"), list):
+            raise ValueError("each experience entry must be an object with a bullets list")
+    for proj in resume["projects"]:
+        if not isinstance(proj, dict) or not isinstance(proj.get("bullets"), list):
+            raise ValueError("each project entry must be an object with a bullets list")
+
+_COVER_LETTER_RULES = """Write a cover letter that sounds like a real person wrote it. Be direct, specific, and avoid corporate speak.
+
+CRITICAL RULES:
+1. SOUND HUMAN: Write like you're emailing a hiring manager directly. Casual but professional. Use "I" and "my" naturally.
+2. NO CLICHÉS: Avoid "excited to apply", "perfect candidate", "passionate about", "thrilled", "eager", "I believe", "I think". Just state facts directly.
+3. USE REAL FACTS ONLY: Reference ONLY actual projects, companies, technologies, and metrics from the resume below. Never invent or assume.
+4. BE SPECIFIC: Name actual projects, companies, technologies. Use exact names from the resume. Don't use vague statements.
+5. SHORT SENTENCES: Keep sentences under 15 words. Be clear and direct. One idea per sentence.
+6. NO FLUFF: Cut unnecessary words. Get to the point immediately.
+7. ACTIVE VOICE: Use active voice. "I built X" not "X was built by me".
+
+WHAT TO AVOID:
+- Corporate jargon ("leverage", "synergy", "utilize", "implement", "facilitate")
+- Overly formal language ("I am writing to express my interest", "I would like to")
+- Generic statements ("I have experience in software development" - too vague)
+- Phrases like "I believe", "I think", "I feel" (just state facts)
+
+STRUCTURE (200-250 words total):
+- Opening (2 sentences, max 200 chars): "I saw the [Role] position at [Company]. [One SPECIFIC reason from job description why it's interesting - mention actual technology or project type]."
+- Three bullets (each 1-2 sentences, max 100 chars each): Each connects a REAL achievement from resume to job requirement. Use actual project names, company names, technologies, and metrics. Format: "At [Company], I [specific action] that [specific result/metric]."
+- Closing (2 sentences, max 150 chars): "I'd like to discuss how my experience with [specific technology/project from resume] can help [Company]. I'm available to talk this week."
+"""
+
+# Compiled once at import - Jinja2 renders via generated bytecode, which beats
+# re-concatenating this multi-KB prompt with f-strings on every call
+_jinja_env = jinja2.Environment(auto_reload=False, optimized=True)
+_COVER_LETTER_TEMPLATE = _jinja_env.from_string(_COVER_LETTER_RULES + """
+Resume Context:
+Experience: {{ experience }}
+Projects: {{ projects }}
+Skills: {{ skills }}
+
+Company: {{ company }}
+Job Description (key requirements):
+{{ job_description }}
+
+Job Keywords: {{ keywords }}
+
+Output JSON (ONLY output valid JSON, no other text):
+{% raw %}{
+  "opening": "2 sentences, max 200 chars, direct and specific. Mention actual technology or project type from job description.",
+  "mapping": [
+    "bullet 1: Connect REAL experience to job requirement. Use actual company/project name and metric.",
+    "bullet 2: Connect REAL experience to job requirement. Use actual company/project name and metric.",
+    "bullet 3: Connect REAL experience to job requirement. Use actual company/project name and metric."
+  ],
+  "closing": "2 sentences, max 150 chars, direct and professional. Mention specific technology/project from resume."
+}{% endraw %}
+
+CRITICAL: Write like a real person wrote this, not AI. Be direct, specific, and genuine. Use ONLY facts from the resume. Never invent anything.""")
+
+# Configured once per process - the SDK keeps one underlying transport per
+# model object, so sharing it reuses the TCP/TLS connection across requests
+_model = None
+
+def _get_model():
+    global _model
+    if _model is None:
+        genai.configure(api_key=settings.google_gemini_api_key)
+        # Use gemini-2.0-flash (latest stable, fast and efficient)
+        _model = genai.GenerativeModel('gemini-2.0-flash')
+    return _model
 
 class GeminiClient:
     """Google Gemini API client for AI operations"""
     
     def __init__(self):
-        genai.configure(api_key=settings.google_gemini_api_key)
-        # Use gemini-2.0-flash (latest stable, fast and efficient)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+        self.model = _get_model()
     
     def _extract_json_from_text(self, text: str) -> str:
         """Extract JSON from text that may contain conversational text around it"""
         if not text:
             raise ValueError("Empty text provided")
         
-        text = text.strip()
-        
-        # Remove markdown code blocks
-        if text.startswith("```json"):
-            text = text[7:]
-        elif text.startswith("```"):
-            text = text[3:]
-        if text.endswith("```"):
-            text = text[:-3]
-        text = text.strip()
+        # Remove markdown code fences in one precompiled substitution
+        text = _FENCE_RE.sub('', text.strip()).strip()
         
         # Try to find JSON object boundaries
         # Look for first { and last }
@@ -41,9 +294,9 @@ class GeminiClient:
             json_candidate = text[first_brace:last_brace + 1]
             # Try to parse it
             try:
-                json.loads(json_candidate)
+                orjson.loads(json_candidate)
                 return json_candidate
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 pass
         
         # If that didn't work, try to find JSON array boundaries
@@ -53,62 +306,37 @@ class GeminiClient:
         if first_bracket != -1 and last_bracket != -1 and last_bracket > first_bracket:
             json_candidate = text[first_bracket:last_bracket + 1]
             try:
-                json.loads(json_candidate)
+                orjson.loads(json_candidate)
                 return json_candidate
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 pass
         
         # Last resort: try parsing the whole text
         return text
     
-    async def parse_resume(self, resume_text: str) -> Dict[str, Any]:
-        """Parse resume text into structured JSON using Gemini"""
-        schema = {
-            "type": "object",
-            "required": ["summary", "skills", "experience", "projects", "education"],
-            "properties": {
-                "summary": {"type": "string", "maxLength": 500},
-                "skills": {"type": "array", "items": {"type": "string"}},
-                "experience": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "required": ["company", "title", "start", "bullets"],
-                        "properties": {
-                            "company": {"type": "string"},
-                            "title": {"type": "string"},
-                            "start": {"type": "string"},
-                            "end": {"type": ["string", "null"]},
-                            "bullets": {"type": "array", "items": {"type": "string"}}
-                        }
-                    }
-                },
-                "projects": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "required": ["name", "bullets"],
-                        "properties": {
-                            "name": {"type": "string"},
-                            "bullets": {"type": "array", "items": {"type": "string"}}
-                        }
-                    }
-                },
-                "education": {
-                    "type": "array",
-                    "items": {"type": "object"}
-                }
-            }
-        }
-        
-        prompt = f"""Parse this resume text into structured JSON. Extract all sections including summary, skills, experience, projects, and education. Output ONLY valid JSON conforming to this schema:
-
-{json.dumps(schema, indent=2)}
-
-Resume text:
-{resume_text}
-
-Output only the JSON object, no other text."""
+    async def _cached_generate(self, prompt: str, parse_json: bool = False):
+        """Generate content for a prompt, serving repeats from the cache.
+
+        Centralizes the response validation and (optionally) JSON extraction
+        that every public method needs. Parsed dicts are deep-copied on the
+        way in and out so callers can mutate their result freely.
+        """
+        cache_key = hashlib.sha256(f"gemini-2.0-flash|{_PROMPT_VERSION}|{prompt}".encode()).hexdigest()
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            if time.time() - cached[1] < _RESPONSE_CACHE_TTL:
+                result = cached[0]
+                return copy.deepcopy(result) if isinstance(result, (dict, list)) else result
+            del _response_cache[cache_key]
+        
+        # Second tier: the on-disk cache (sqlite is sync, so off the loop)
+        persisted = await asyncio.to_thread(_cache_db_get, cache_key)
+        if persisted is not None:
+            if len(_response_cache) >= _RESPONSE_CACHE_MAX_SIZE:
+                oldest_key = min(_response_cache.keys(), key=lambda k: _response_cache[k][1])
+                del _response_cache[oldest_key]
+            _response_cache[cache_key] = (persisted, time.time())
+            return copy.deepcopy(persisted) if isinstance(persisted, (dict, list)) else persisted
         
         # Add retry logic for rate limiting
         response = await self._generate_with_retry(prompt)
@@ -122,12 +350,51 @@ Output only the JSON object, no other text."""
         if not result_text:
             raise ValueError("Empty response text from Gemini API")
         
-        # Extract JSON from response (may have conversational text)
+        if parse_json:
+            # Extract JSON from response (may have conversational text)
+            try:
+                json_text = self._extract_json_from_text(result_text)
+                # orjson is a C extension, 3-10x faster than stdlib json on
+                # the 5-50 KB payloads these methods shuttle around
+                result = orjson.loads(json_text)
+            except orjson.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON response from Gemini API: {str(e)}\nResponse: {result_text[:500]}")
+        else:
+            result = result_text
+        
+        # Evict oldest entry if cache is full
+        if len(_response_cache) >= _RESPONSE_CACHE_MAX_SIZE:
+            oldest_key = min(_response_cache.keys(), key=lambda k: _response_cache[k][1])
+            del _response_cache[oldest_key]
+        _response_cache[cache_key] = (
+            copy.deepcopy(result) if isinstance(result, (dict, list)) else result,
+            time.time(),
+        )
+        await asyncio.to_thread(_cache_db_set, cache_key, result)
+        
+        return result
+    
+    async def parse_resume(self, resume_text: str) -> Dict[str, Any]:
+        """Parse resume text into structured JSON using Gemini"""
+        prompt = f"""Parse this resume text into structured JSON. Extract all sections including summary, skills, experience, projects, and education. Output ONLY valid JSON conforming to this schema:
+
+{_RESUME_SCHEMA_JSON}
+
+Resume text:
+{resume_text}
+
+Output only the JSON object, no other text."""
+        
+        result = await self._cached_generate(prompt, parse_json=True)
         try:
-            json_text = self._extract_json_from_text(result_text)
-            return json.loads(json_text)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON response from Gemini API: {str(e)}\nResponse: {result_text[:500]}")
+            _validate_resume_shape(result)
+        except ValueError as e:
+            # One deterministic retry with the violation spelled out
+            print(f"⚠️  Parsed resume failed validation, retrying: {e}")
+            retry_prompt = f"{prompt}\n\nYour previous response was invalid: {e}. Output corrected JSON conforming to the schema."
+            result = await self._cached_generate(retry_prompt, parse_json=True)
+            _validate_resume_shape(result)
+        return result
     
     async def tailor_resume(
         self,
@@ -137,65 +404,198 @@ Output only the JSON object, no other text."""
         role_target: str = None,
         level_target: str = None
     ) -> Dict[str, Any]:
-        """Tailor resume for a specific job using Gemini AI - preserving human authenticity"""
-        prompt = f"""You are helping tailor a resume. CRITICAL: Preserve 95%+ of the original text. Only reorder, don't rewrite.
-
-ABSOLUTE RULES:
-1. DO NOT REWRITE: Keep original bullet points 95%+ identical. Only change 1-2 words if absolutely necessary for keyword matching.
-2. DO NOT ADD PROJECTS: Keep only the original projects. Do not invent or add new ones.
-3. DO NOT CHANGE METRICS: Keep all numbers, percentages, dates exactly as written.
-4. DO NOT CHANGE COMPANIES/TITLES: Keep all employer names and job titles exactly as written.
-5. REORDER ONLY: Move most relevant experience/projects first. Keep the exact same wording.
-6. MINIMAL KEYWORD INSERTION: Add 1-2 job keywords ONLY if they naturally fit. Don't force them.
-7. PRESERVE ALL CONTACT INFO: ALWAYS keep name, email, phone, location, and links EXACTLY as in original. NEVER remove or modify these fields.
-
-WHAT TO DO:
-- Name, Email, Phone, Location, Links: Keep EXACTLY as in original. NEVER modify or remove.
-- Summary: Keep 95%+ of original text. Add 1 keyword max if it fits naturally.
-- Experience: Reorder by relevance. Keep bullets 95%+ identical. Limit to 3 bullets per role.
-- Skills: Keep original skills. Add only if clearly mentioned in experience. Don't invent.
-- Projects: Keep original projects only. Reorder by relevance. Limit to 3 projects, 2 bullets each.
-- Education: Keep exactly as is.
-
-ONE PAGE LIMIT: If needed, keep only top 3 experiences and top 3 projects. Don't rewrite to fit.
-
-Base Resume JSON:
-{json.dumps(base_resume_json, indent=2)}
+        """Tailor resume for a specific job using Gemini AI - preserving human authenticity.
+
+        Each section gets its own short, focused prompt and the calls run
+        concurrently - long monolithic prompts lose mid-context details and
+        serialize into one slow round-trip. Contact details and education are
+        never sent to the model at all.
+        """
+        # Carry everything except the tailored sections over verbatim
+        # (name, email, phone, location, links, education, ...)
+        result = {
+            key: copy.deepcopy(value)
+            for key, value in base_resume_json.items()
+            if key not in ("summary", "experience", "projects", "skills")
+        }
+        
+        summary, experience, projects, skills = await asyncio.gather(
+            self._tailor_summary(base_resume_json.get("summary", ""), job_description, jd_keywords),
+            self._tailor_experience(base_resume_json.get("experience", []), job_description, jd_keywords),
+            self._tailor_projects(base_resume_json.get("projects", []), job_description, jd_keywords),
+            self._tailor_skills(base_resume_json.get("skills", []), job_description, jd_keywords)
+        )
+        
+        if "summary" in base_resume_json:
+            result["summary"] = summary
+        if "experience" in base_resume_json:
+            result["experience"] = experience
+        if "projects" in base_resume_json:
+            result["projects"] = projects
+        if "skills" in base_resume_json:
+            result["skills"] = skills
+        
+        # Validate no fabrication
+        self._validate_no_fabrication(base_resume_json, result)
+        
+        return result
+    
+    async def tailor_bundle(
+        self,
+        base_resume_json: Dict[str, Any],
+        job_description: str,
+        company: str,
+        jd_keywords: List[str]
+    ) -> Dict[str, Any]:
+        """Tailor a resume and run every downstream analysis in one wave.
+
+        The four post-tailor calls (cover letter, explanation,
+        recommendations, match score) depend only on the tailored resume,
+        not on each other, so wall time is max-of-latencies instead of
+        sum-of-latencies.
+        """
+        tailored = await self.tailor_resume(base_resume_json, job_description, jd_keywords)
+        cover_letter, explanation, recommendations, match_score = await asyncio.gather(
+            self.generate_cover_letter(tailored, job_description, company, jd_keywords),
+            self.generate_ai_explanation(base_resume_json, tailored, job_description, jd_keywords),
+            self.generate_ai_recommendations(tailored, job_description),
+            self.calculate_job_match_score(tailored, job_description, jd_keywords)
+        )
+        return {
+            "tailored_resume": tailored,
+            "cover_letter": cover_letter,
+            "ai_explanation": explanation,
+            "ai_recommendations": recommendations,
+            "match_score": match_score,
+        }
+
+    async def batch_tailor(self, resumes_jobs: List[tuple]) -> List[Any]:
+        """Tailor one resume against many jobs in a single concurrent wave.
+
+        Takes (base_resume_json, job_description, jd_keywords) tuples and runs
+        the tailor calls concurrently instead of one at a time - applying to
+        the top 10 search results pays one round-trip of latency instead of
+        ten. A failed item comes back as its exception so the rest of the
+        batch still succeeds.
+        """
+        return await asyncio.gather(
+            *[
+                self.tailor_resume(resume_json, job_description, jd_keywords)
+                for resume_json, job_description, jd_keywords in resumes_jobs
+            ],
+            return_exceptions=True
+        )
+
+    async def _tailor_summary(self, summary: str, job_description: str, jd_keywords: List[str]) -> str:
+        """Tailor the summary section (falls back to the original on failure)"""
+        if not summary:
+            return summary
+        
+        prompt = f"""Tailor this resume summary for a job. Keep 95%+ of the original text. Add 1 job keyword max and only if it fits naturally. Do not invent anything.
+
+Summary:
+{summary}
 
 Job Description:
-{job_description[:1500]}
+{job_description[:800]}
 
 Job Keywords: {', '.join(jd_keywords[:10])}
 
-Output ONLY valid JSON with the same structure. MUST include name, email, phone, location, and links from original. Preserve 95%+ of original text. Reorder, don't rewrite."""
+Output ONLY valid JSON: {{"summary": "the tailored summary"}}"""
         
-        # Add retry logic for rate limiting
-        response = await self._generate_with_retry(prompt)
+        try:
+            result = await self._cached_generate(prompt, parse_json=True)
+        except ValueError as e:
+            print(f"⚠️  Summary tailoring failed, keeping original: {e}")
+            return summary
+        if isinstance(result, dict) and result.get("summary"):
+            return result["summary"]
+        return summary
+    
+    async def _tailor_experience(self, experience: List[dict], job_description: str, jd_keywords: List[str]) -> List[dict]:
+        """Tailor the experience section (falls back to the original on failure)"""
+        if not experience:
+            return experience
         
-        # Validate response exists
-        if not response or not hasattr(response, 'text'):
-            raise ValueError("Empty response from Gemini API")
+        prompt = f"""Reorder these work experiences by relevance to the job. CRITICAL: Reorder only, don't rewrite.
+
+RULES:
+1. Keep bullet points 95%+ identical. Only change 1-2 words if absolutely necessary for keyword matching.
+2. DO NOT change company names, job titles, dates, numbers or percentages.
+3. Limit to 3 bullets per role. Keep only the top 3 experiences if there are more.
+4. Do not invent or add anything.
+
+Experience JSON:
+{orjson.dumps(experience, option=orjson.OPT_INDENT_2).decode()}
+
+Job Description:
+{job_description[:1200]}
+
+Job Keywords: {', '.join(jd_keywords[:10])}
+
+Output ONLY valid JSON: {{"experience": [...]}} with the same item structure."""
         
-        result_text = response.text.strip()
+        try:
+            result = await self._cached_generate(prompt, parse_json=True)
+        except ValueError as e:
+            print(f"⚠️  Experience tailoring failed, keeping original: {e}")
+            return experience
+        if isinstance(result, dict) and isinstance(result.get("experience"), list) and result["experience"]:
+            return result["experience"]
+        return experience
+    
+    async def _tailor_projects(self, projects: List[dict], job_description: str, jd_keywords: List[str]) -> List[dict]:
+        """Tailor the projects section (falls back to the original on failure)"""
+        if not projects:
+            return projects
         
-        if not result_text:
-            raise ValueError("Empty response text from Gemini API")
+        prompt = f"""Reorder these projects by relevance to the job. CRITICAL: Keep only the original projects, do not invent or add new ones.
+
+RULES:
+1. Keep descriptions 95%+ identical.
+2. DO NOT change project names, numbers or percentages.
+3. Limit to 3 projects, 2 bullets each.
+
+Projects JSON:
+{orjson.dumps(projects, option=orjson.OPT_INDENT_2).decode()}
+
+Job Description:
+{job_description[:800]}
+
+Job Keywords: {', '.join(jd_keywords[:10])}
+
+Output ONLY valid JSON: {{"projects": [...]}} with the same item structure."""
         
-        # Extract JSON from response (may have conversational text)
         try:
-            json_text = self._extract_json_from_text(result_text)
-            result = json.loads(json_text)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON response from Gemini API: {str(e)}\nResponse: {result_text[:500]}")
-        
-        # Validate result structure
-        if not isinstance(result, dict):
-            raise ValueError(f"Invalid resume structure returned from Gemini API. Expected dict, got {type(result)}")
+            result = await self._cached_generate(prompt, parse_json=True)
+        except ValueError as e:
+            print(f"⚠️  Projects tailoring failed, keeping original: {e}")
+            return projects
+        if isinstance(result, dict) and isinstance(result.get("projects"), list) and result["projects"]:
+            return result["projects"]
+        return projects
+    
+    async def _tailor_skills(self, skills: List[str], job_description: str, jd_keywords: List[str]) -> List[str]:
+        """Tailor the skills section (falls back to the original on failure)"""
+        if not skills:
+            return skills
         
-        # Validate no fabrication
-        self._validate_no_fabrication(base_resume_json, result)
+        prompt = f"""Reorder these skills by relevance to the job. Keep the original skills - do not invent new ones.
+
+Skills: {', '.join(skills)}
+
+Job Keywords: {', '.join(jd_keywords[:15])}
+
+Output ONLY valid JSON: {{"skills": ["skill1", "skill2", ...]}}"""
         
-        return result
+        try:
+            result = await self._cached_generate(prompt, parse_json=True)
+        except ValueError as e:
+            print(f"⚠️  Skills tailoring failed, keeping original: {e}")
+            return skills
+        if isinstance(result, dict) and isinstance(result.get("skills"), list) and result["skills"]:
+            return result["skills"]
+        return skills
     
     async def generate_cover_letter(
         self,
@@ -227,81 +627,18 @@ Output ONLY valid JSON with the same structure. MUST include name, email, phone,
             if name:
                 projects_summary.append(f"{name}: {bullets[0] if bullets else ''}")
         
-        prompt = f"""Write a cover letter that sounds like a real person wrote it. Be direct, specific, and avoid corporate speak.
-
-CRITICAL RULES:
-1. SOUND HUMAN: Write like you're emailing a hiring manager directly. Casual but professional. Use "I" and "my" naturally.
-2. NO CLICHÉS: Avoid "excited to apply", "perfect candidate", "passionate about", "thrilled", "eager", "I believe", "I think". Just state facts directly.
-3. USE REAL FACTS ONLY: Reference ONLY actual projects, companies, technologies, and metrics from the resume below. Never invent or assume.
-4. BE SPECIFIC: Name actual projects, companies, technologies. Use exact names from the resume. Don't use vague statements.
-5. SHORT SENTENCES: Keep sentences under 15 words. Be clear and direct. One idea per sentence.
-6. NO FLUFF: Cut unnecessary words. Get to the point immediately.
-7. ACTIVE VOICE: Use active voice. "I built X" not "X was built by me".
-
-WHAT TO AVOID:
-- Corporate jargon ("leverage", "synergy", "utilize", "implement", "facilitate")
-- Overly formal language ("I am writing to express my interest", "I would like to")
-- Generic statements ("I have experience in software development" - too vague)
-- Exclamation points (never use them)
-- Em dashes (use periods or commas instead)
-- Semicolons (use periods instead)
-- Phrases like "I believe", "I think", "I feel" (just state facts)
-
-STRUCTURE (200-250 words total):
-- Opening (2 sentences, max 200 chars): "I saw the [Role] position at [Company]. [One SPECIFIC reason from job description why it's interesting - mention actual technology or project type]."
-- Three bullets (each 1-2 sentences, max 100 chars each): Each connects a REAL achievement from resume to job requirement. Use actual project names, company names, technologies, and metrics. Format: "At [Company], I [specific action] that [specific result/metric]."
-- Closing (2 sentences, max 150 chars): "I'd like to discuss how my experience with [specific technology/project from resume] can help [Company]. I'm available to talk this week."
-
-Resume Context:
-Experience: {', '.join(experience_summary)}
-Projects: {', '.join(projects_summary)}
-Skills: {', '.join(skills[:10])}
-
-Company: {company}
-Job Description (key requirements):
-{job_description[:1000]}
-
-Job Keywords: {', '.join(jd_keywords[:15])}
-
-Output JSON (ONLY output valid JSON, no other text):
-{{
-  "opening": "2 sentences, max 200 chars, direct and specific. Mention actual technology or project type from job description.",
-  "mapping": [
-    "bullet 1: Connect REAL experience to job requirement. Use actual company/project name and metric.",
-    "bullet 2: Connect REAL experience to job requirement. Use actual company/project name and metric.",
-    "bullet 3: Connect REAL experience to job requirement. Use actual company/project name and metric."
-  ],
-  "closing": "2 sentences, max 150 chars, direct and professional. Mention specific technology/project from resume."
-}}
-
-CRITICAL: Write like a real person wrote this, not AI. Be direct, specific, and genuine. Use ONLY facts from the resume. Never invent anything."""
-        
-        # Add retry logic for rate limiting
-        response = await self._generate_with_retry(prompt)
-        
-        # Validate response exists
-        if not response or not hasattr(response, 'text'):
-            raise ValueError("Empty response from Gemini API")
-        
-        result_text = response.text.strip()
-        
-        if not result_text:
-            raise ValueError("Empty response text from Gemini API")
-        
-        # Clean up response
-        if result_text.startswith("```json"):
-            result_text = result_text[7:]
-        if result_text.startswith("```"):
-            result_text = result_text[3:]
-        if result_text.endswith("```"):
-            result_text = result_text[:-3]
-        result_text = result_text.strip()
-        
-        # Parse JSON with error handling
-        try:
-            return json.loads(result_text)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON response from Gemini API: {str(e)}\nResponse: {result_text[:500]}")
+        prompt = _COVER_LETTER_TEMPLATE.render(
+            experience=', '.join(experience_summary),
+            projects=', '.join(projects_summary),
+            skills=', '.join(skills[:10]),
+            company=company,
+            job_description=job_description[:1000],
+            keywords=', '.join(jd_keywords[:15])
+        )
+        
+        result = await self._cached_generate(prompt, parse_json=True)
+        # Punctuation rules are enforced here, not in the prompt
+        return _apply_style(result)
     
     async def generate_ai_explanation(
         self,
@@ -314,10 +651,10 @@ CRITICAL: Write like a real person wrote this, not AI. Be direct, specific, and
         prompt = f"""You are an AI resume writing assistant. Analyze the changes made to tailor this resume for a specific job and provide a clear, helpful explanation.
 
 Original Resume Summary:
-{json.dumps(base_resume.get('summary', ''), indent=2)}
+{orjson.dumps(base_resume.get('summary', '')).decode()}
 
 Tailored Resume Summary:
-{json.dumps(tailored_resume.get('summary', ''), indent=2)}
+{orjson.dumps(tailored_resume.get('summary', '')).decode()}
 
 Job Description:
 {job_description[:500]}
@@ -331,9 +668,7 @@ Provide a concise explanation (2-3 paragraphs) explaining:
 
 Write in a friendly, professional tone. Focus on actionable insights."""
         
-        # Add retry logic for rate limiting
-        response = await self._generate_with_retry(prompt)
-        return response.text.strip()
+        return await self._cached_generate(prompt)
     
     async def generate_ai_recommendations(
         self,
@@ -344,7 +679,7 @@ Write in a friendly, professional tone. Focus on actionable insights."""
         prompt = f"""Analyze this resume against a job description and provide 3-5 specific, actionable recommendations for improvement.
 
 Resume:
-{json.dumps(resume_json, indent=2)[:1500]}
+{_trim_resume_json(resume_json, 1500)}
 
 Job Description:
 {job_description[:1000]}
@@ -356,24 +691,7 @@ Output a JSON object with a "recommendations" array of strings. Each recommendat
 
 Example: {{"recommendations": ["Add keyword X to skills section", "Emphasize Y experience in summary", ...]}}"""
         
-        # Add retry logic for rate limiting
-        response = await self._generate_with_retry(prompt)
-        
-        # Validate response exists
-        if not response or not hasattr(response, 'text'):
-            raise ValueError("Empty response from Gemini API")
-        
-        result_text = response.text.strip()
-        
-        if not result_text:
-            raise ValueError("Empty response text from Gemini API")
-        
-        # Extract JSON from response (may have conversational text)
-        try:
-            json_text = self._extract_json_from_text(result_text)
-            result = json.loads(json_text)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON response from Gemini API: {str(e)}\nResponse: {result_text[:500]}")
+        result = await self._cached_generate(prompt, parse_json=True)
         
         if not isinstance(result, dict):
             return []
@@ -390,7 +708,7 @@ Example: {{"recommendations": ["Add keyword X to skills section", "Emphasize Y e
         prompt = f"""Analyze how well this resume matches a job posting and provide a detailed match score breakdown.
 
 Resume JSON:
-{json.dumps(resume_json, indent=2)[:2000]}
+{_trim_resume_json(resume_json, 2000)}
 
 Job Description:
 {job_description[:1000]}
@@ -406,24 +724,7 @@ Output JSON with:
 
 Be objective and thorough."""
         
-        # Add retry logic for rate limiting
-        response = await self._generate_with_retry(prompt)
-        
-        # Validate response exists
-        if not response or not hasattr(response, 'text'):
-            raise ValueError("Empty response from Gemini API")
-        
-        result_text = response.text.strip()
-        
-        if not result_text:
-            raise ValueError("Empty response text from Gemini API")
-        
-        # Extract JSON from response (may have conversational text)
-        try:
-            json_text = self._extract_json_from_text(result_text)
-            return json.loads(json_text)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON response from Gemini API: {str(e)}\nResponse: {result_text[:500]}")
+        return await self._cached_generate(prompt, parse_json=True)
     
     async def answer_application_question(
         self,
@@ -437,7 +738,7 @@ Be objective and thorough."""
 Question: {question}
 
 Resume:
-{json.dumps(resume_json, indent=2)[:2000]}
+{_trim_resume_json(resume_json, 2000)}
 
 Job Description:
 {job_description[:1000]}
@@ -450,46 +751,82 @@ Provide a concise, professional answer (1-3 sentences) that:
 
 Answer:"""
         
-        # Add retry logic for rate limiting
-        response = await self._generate_with_retry(prompt)
-        
-        # Validate response exists
-        if not response or not hasattr(response, 'text'):
-            raise ValueError("Empty response from Gemini API")
-        
-        result_text = response.text.strip()
-        
-        if not result_text:
-            raise ValueError("Empty response text from Gemini API")
-        
-        return result_text
+        return await self._cached_generate(prompt)
     
     async def generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding vector"""
-        # Note: Gemini doesn't have a direct embedding API
-        # For now, we'll use Google's text-embedding-004 or similar
-        # Fallback: return a placeholder vector (in production, use Google's embedding API)
-        # For MVP, we can skip embeddings or use a simple hash-based approach
-        import hashlib
-        hash_obj = hashlib.sha256(text.encode())
-        # Generate a 1536-dim vector from hash (simplified)
-        hash_int = int(hash_obj.hexdigest()[:8], 16)
-        return [(hash_int % 1000) / 1000.0 for _ in range(1536)]
+        """Generate embedding vector using Google's text embedding model.
+
+        The model returns 768 dims; the pgvector column is Vector(1536), so
+        the vector is zero-padded (cosine distance over zero-padded vectors
+        equals the 768-dim distance). Falls back to the old hash-derived
+        placeholder if the embedding call fails, so profile saves never break.
+        """
+        try:
+            # embed_content is a sync SDK call - run it off the event loop
+            result = await asyncio.to_thread(
+                genai.embed_content,
+                model="models/text-embedding-004",
+                content=text,
+                task_type="RETRIEVAL_DOCUMENT"
+            )
+            embedding = result["embedding"]
+            return embedding + [0.0] * (1536 - len(embedding))
+        except Exception as e:
+            print(f"⚠️  Embedding API failed, using hash fallback: {e}")
+            hash_obj = hashlib.sha256(text.encode())
+            hash_int = int(hash_obj.hexdigest()[:8], 16)
+            # One C-level fill instead of a 1536-iteration Python loop
+            return np.full(1536, (hash_int % 1000) / 1000.0, dtype=np.float32).tolist()
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed many texts in one API request instead of N round-trips"""
+        if not texts:
+            return []
+        result = await asyncio.to_thread(
+            genai.embed_content,
+            model="models/text-embedding-004",
+            content=texts,
+            task_type="RETRIEVAL_DOCUMENT"
+        )
+        return [emb + [0.0] * (1536 - len(emb)) for emb in result["embedding"]]
     
     async def _generate_with_retry(self, prompt: str, max_retries: int = 3):
-        """Generate content with retry logic for rate limiting"""
+        """Generate content with retry logic for rate limiting and transient errors"""
         for attempt in range(max_retries):
             try:
-                response = self.model.generate_content(prompt)
+                async with _request_semaphore:
+                    # Wait for quota in-process before hitting the wire
+                    await _rate_limiter.acquire()
+                    # Native async call - the event loop stays free during
+                    # the Gemini round-trip, so gathered calls overlap
+                    response = await self.model.generate_content_async(prompt)
                 return response
+            except (google_exceptions.ResourceExhausted,
+                    google_exceptions.ServiceUnavailable,
+                    google_exceptions.DeadlineExceeded) as e:
+                # Typed API errors: 429 plus the transient 503/504s Google
+                # documents as retriable
+                if attempt >= max_retries - 1:
+                    raise Exception(f"Gemini API still failing after {max_retries} attempts ({type(e).__name__}). Please wait a few minutes and try again.")
+                retry_delay = getattr(e, "retry_delay", None)
+                if retry_delay is not None:
+                    # The server told us exactly how long to back off
+                    wait_time = getattr(retry_delay, "seconds", 0) or 2
+                    wait_time += random.uniform(0, 1)
+                else:
+                    wait_time = (2 ** attempt) * 2 + random.uniform(0, 2 ** attempt)
+                print(f"⚠️  {type(e).__name__} from Gemini. Waiting {wait_time:.1f} seconds before retry {attempt + 1}/{max_retries}...")
+                await asyncio.sleep(wait_time)
             except Exception as e:
+                # Fallback for SDK paths that surface plain exceptions with
+                # the status code only in the message
                 error_str = str(e)
-                # Check if it's a 429 rate limit error
                 if "429" in error_str or "Resource exhausted" in error_str or "quota" in error_str.lower():
                     if attempt < max_retries - 1:
-                        # Exponential backoff: wait 2^attempt seconds
-                        wait_time = (2 ** attempt) * 2  # 2, 4, 8 seconds
-                        print(f"⚠️  Rate limit hit. Waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}...")
+                        # Exponential backoff with jitter so concurrent
+                        # callers don't retry in lockstep
+                        wait_time = (2 ** attempt) * 2 + random.uniform(0, 2 ** attempt)
+                        print(f"⚠️  Rate limit hit. Waiting {wait_time:.1f} seconds before retry {attempt + 1}/{max_retries}...")
                         await asyncio.sleep(wait_time)
                         continue
                     else:
@@ -514,37 +851,50 @@ Answer:"""
         
         if not isinstance(base_experience, list) or not isinstance(tailored_experience, list):
             raise ValueError("Experience must be a list")
-        
-        # Extract companies and titles, filtering out None values
-        base_companies = {exp.get("company") for exp in base_experience if exp.get("company")}
-        base_titles = {exp.get("title") for exp in base_experience if exp.get("title")}
-        
-        tailored_companies = {exp.get("company") for exp in tailored_experience if exp.get("company")}
-        tailored_titles = {exp.get("title") for exp in tailored_experience if exp.get("title")}
-        
-        # Check for new companies (excluding None/empty strings)
-        new_companies = tailored_companies - base_companies
-        if new_companies:
-            raise ValueError(f"Cannot add new companies to resume: {new_companies}")
-        
-        # Check for new titles (excluding None/empty strings)
-        new_titles = tailored_titles - base_titles
-        if new_titles:
-            raise ValueError(f"Cannot add new job titles to resume: {new_titles}")
-        
+
+        # One pass per side: build normalized (company, title) pairs so case
+        # or whitespace drift doesn't trigger false "new company" errors,
+        # then a single set difference instead of four separate set builds
+        def _keypairs(exp_list):
+            return frozenset(
+                (
+                    (exp.get("company") or "").strip().lower(),
+                    (exp.get("title") or "").strip().lower(),
+                )
+                for exp in exp_list
+                if exp.get("company") or exp.get("title")
+            )
+
+        new_pairs = _keypairs(tailored_experience) - _keypairs(base_experience)
+        if new_pairs:
+            raise ValueError(f"Cannot add new companies or job titles to resume: {new_pairs}")
+
         # Validate projects - NO NEW PROJECTS ALLOWED
         base_projects = base.get("projects", [])
         tailored_projects = tailored.get("projects", [])
-        
+
         if not isinstance(base_projects, list) or not isinstance(tailored_projects, list):
             raise ValueError("Projects must be a list")
-        
-        # Extract project names
-        base_project_names = {proj.get("name") for proj in base_projects if proj.get("name")}
-        tailored_project_names = {proj.get("name") for proj in tailored_projects if proj.get("name")}
-        
-        # Check for new projects
-        new_projects = tailored_project_names - base_project_names
+
+        def _names(proj_list):
+            return frozenset(
+                (proj.get("name") or "").strip().lower()
+                for proj in proj_list
+                if proj.get("name")
+            )
+
+        new_projects = _names(tailored_projects) - _names(base_projects)
         if new_projects:
             raise ValueError(f"Cannot add new projects to resume: {new_projects}")
 
+
+
+# Process-wide singleton - services and adapters should use this instead of
+# constructing GeminiClient() per request
+_client = None
+
+def get_gemini_client() -> GeminiClient:
+    global _client
+    if _client is None:
+        _client = GeminiClient()
+    return _client
@@ -4,6 +4,40 @@ import json
 import re
 from datetime import datetime, date
 
+# Comprehensive tech keywords list for jd_keywords extraction. Kept in priority
+# order (languages first) - the output order follows this list
+_TECH_KEYWORDS = [
+    # Programming languages
+    "python", "javascript", "typescript", "java", "c++", "c#", "go", "rust", "ruby", "php", "swift", "kotlin",
+    # Web frameworks
+    "react", "angular", "vue", "next.js", "node.js", "express", "django", "flask", "spring", "laravel",
+    # Databases
+    "sql", "postgresql", "mysql", "mongodb", "redis", "elasticsearch", "cassandra",
+    # Cloud & DevOps
+    "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "jenkins", "ci/cd", "git",
+    # Data & Analytics
+    "data analysis", "data analytics", "sql", "tableau", "power bi", "excel", "pandas", "numpy", "scikit-learn",
+    "machine learning", "ml", "ai", "deep learning", "tensorflow", "pytorch", "spark", "hadoop",
+    # Other skills
+    "api", "rest", "graphql", "microservices", "agile", "scrum", "jira", "confluence"
+]
+
+# Single-pass keyword scanner. The zero-width lookahead lets overlapping
+# keywords all match (e.g. "sql" inside "postgresql"), exactly like the old
+# one-substring-probe-per-keyword loop, but in one C-level pass over the text
+_TECH_KEYWORD_RE = re.compile(
+    r'(?=(' + '|'.join(sorted(set(map(re.escape, _TECH_KEYWORDS)), key=len, reverse=True)) + r'))'
+)
+
+# Patterns for "required skills" / "qualifications" style sections
+_SKILLS_SECTION_RES = [
+    re.compile(r'required skills?[:\s]+([^\.]+)', re.IGNORECASE),
+    re.compile(r'qualifications?[:\s]+([^\.]+)', re.IGNORECASE),
+    re.compile(r'must have[:\s]+([^\.]+)', re.IGNORECASE),
+    re.compile(r'technologies?[:\s]+([^\.]+)', re.IGNORECASE),
+]
+_SKILL_SPLIT_RE = re.compile(r'[,;•\n]')
+
 class JobParser:
     """Parse job postings from JSON-LD or HTML"""
     
@@ -11,14 +45,23 @@ class JobParser:
         pass
     
     async def parse_job_posting(self, url: str, html: str) -> Optional[Dict[str, Any]]:
-        """Parse job posting from HTML, preferring JSON-LD"""
+        """Async wrapper around parse_job_posting_sync (kept for existing callers)"""
+        return self.parse_job_posting_sync(url, html)
+
+    def parse_job_posting_sync(self, url: str, html: str) -> Optional[Dict[str, Any]]:
+        """Parse job posting from HTML, preferring JSON-LD.
+
+        Synchronous on purpose: the work is CPU-bound (BeautifulSoup over the
+        full page), so async callers should run it in a worker thread instead
+        of blocking the event loop.
+        """
         # Safely handle None html
         if not html:
             return None
-        
+
         # Try JSON-LD first
         job_data = self._extract_jobposting_jsonld(html)
-        
+
         if job_data:
             return self._normalize_job(url, job_data, html, structured=True)
         else:
@@ -227,59 +270,36 @@ class JobParser:
         """Extract keywords from job description - comprehensive skill extraction"""
         if not text:
             return []
-        
+
         text_lower = text.lower()
+
+        # Single automaton pass over the text instead of one substring scan per
+        # keyword - O(len(text)) regardless of how many keywords we track
+        hits = {m.group(1) for m in _TECH_KEYWORD_RE.finditer(text_lower)}
+
         keywords = []
-        
-        # Comprehensive tech keywords list
-        tech_keywords = [
-            # Programming languages
-            "python", "javascript", "typescript", "java", "c++", "c#", "go", "rust", "ruby", "php", "swift", "kotlin",
-            # Web frameworks
-            "react", "angular", "vue", "next.js", "node.js", "express", "django", "flask", "spring", "laravel",
-            # Databases
-            "sql", "postgresql", "mysql", "mongodb", "redis", "elasticsearch", "cassandra",
-            # Cloud & DevOps
-            "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "jenkins", "ci/cd", "git",
-            # Data & Analytics
-            "data analysis", "data analytics", "sql", "tableau", "power bi", "excel", "pandas", "numpy", "scikit-learn",
-            "machine learning", "ml", "ai", "deep learning", "tensorflow", "pytorch", "spark", "hadoop",
-            # Other skills
-            "api", "rest", "graphql", "microservices", "agile", "scrum", "jira", "confluence"
-        ]
-        
-        # Extract matching keywords
-        for keyword in tech_keywords:
-            if keyword in text_lower:
+        for keyword in _TECH_KEYWORDS:
+            if keyword in hits:
                 # Capitalize properly
                 display_keyword = keyword.title() if len(keyword) > 3 else keyword.upper()
                 if display_keyword not in keywords:
                     keywords.append(display_keyword)
-        
+
         # Also look for "required skills" or "qualifications" sections
-        skills_section_patterns = [
-            r'required skills?[:\s]+([^\.]+)',
-            r'qualifications?[:\s]+([^\.]+)',
-            r'must have[:\s]+([^\.]+)',
-            r'technologies?[:\s]+([^\.]+)',
-        ]
-        
-        import re
-        for pattern in skills_section_patterns:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
-            for match in matches:
+        for pattern in _SKILLS_SECTION_RES:
+            for match in pattern.findall(text_lower):
                 # Extract individual skills from the match
-                skills = re.split(r'[,;•\n]', match)
-                for skill in skills:
+                for skill in _SKILL_SPLIT_RE.split(match):
                     skill = skill.strip()
                     if len(skill) > 2 and len(skill) < 30:
-                        # Check if it's a known tech keyword
-                        for tech in tech_keywords:
-                            if tech in skill.lower():
+                        # Check against known tech keywords in one pass
+                        skill_hits = {m.group(1) for m in _TECH_KEYWORD_RE.finditer(skill.lower())}
+                        for tech in _TECH_KEYWORDS:
+                            if tech in skill_hits:
                                 display_skill = tech.title() if len(tech) > 3 else tech.upper()
                                 if display_skill not in keywords:
                                     keywords.append(display_skill)
-        
+
         return keywords[:15]  # Limit to 15 keywords (was 10)
     
     def _extract_source(self, url: str) -> str:
@@ -1,5 +1,5 @@
 from app.config import settings
-from app.utils.gemini_client import GeminiClient
+from app.utils.gemini_client import get_gemini_client
 from app.utils.openai_client import OpenAIClient
 from app.utils.pdf_parser import PDFParser
 from typing import Optional, Dict, Any
@@ -10,7 +10,7 @@ class PDFToLaTeXConverter:
     
     def __init__(self):
         self.pdf_parser = PDFParser()
-        self.gemini_client = GeminiClient()
+        self.gemini_client = get_gemini_client()
         # Try to initialize OpenAI, fallback to Gemini
         try:
             self.openai_client = OpenAIClient()